@@ -1,10 +1,93 @@
 import os
-import httpx
 from loguru import logger
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 import asyncio
 import json
 import re
+import time
+from collections import deque, OrderedDict
+from contextlib import AsyncExitStack
+
+from services.http_pool import http_pool
+from services.cache import copy_cache, make_cache_key
+from services.singleflight import text_flight
+from services.circuit_breaker import breakers
+from services.retry import text_retry
+from services.rate_limit import limiters, AdmissionTimeout
+from services.keywords import KeywordMatcher
+
+# Industry detection keywords, checked in order; the first industry with a hit wins
+INDUSTRY_KEYWORDS = {
+    "fintech": ['bank', 'finance', 'payment', 'fintech', 'crypto', 'wallet', 'investment', 
+               'trading', 'loan', 'credit', 'insurance', 'wealth'],
+    "saas": ['software', 'saas', 'platform', 'tool', 'app', 'productivity', 'cloud', 
+            'devops', 'crm', 'analytics', 'automation', 'workflow'],
+    "ecommerce": ['shop', 'store', 'ecommerce', 'retail', 'product', 'clothing', 'fashion', 
+                 'marketplace', 'boutique', 'apparel', 'accessories'],
+    "healthcare": ['health', 'medical', 'wellness', 'care', 'fitness', 'hospital', 'pharma',
+                  'clinic', 'therapy', 'diagnosis', 'patient'],
+    "education": ['education', 'learning', 'course', 'training', 'school', 'university', 
+                 'edtech', 'student', 'teacher', 'curriculum'],
+    "tech": ['tech', 'ai', 'machine learning', 'data', 'hardware', 'gadget', 'innovation',
+            'semiconductor', 'iot', 'robotics']
+}
+
+
+INDUSTRY_MATCHER = KeywordMatcher({"industry": INDUSTRY_KEYWORDS})
+
+# Prompt intent signals; within each group the first category listed wins
+INTENT_KEYWORDS = KeywordMatcher({
+    "copy_type": {
+        "landing_page": ["landing page", "homepage", "web page"],
+        "email": ["email", "newsletter", "campaign"],
+        "headline": ["headline", "slogan", "tagline"],
+        "product_description": ["product description", "product page"],
+        "about_page": ["about", "about us", "company"],
+        "faq": ["faq", "questions"]
+    },
+    "industry": {industry: [industry] for industry in INDUSTRY_KEYWORDS},
+    "tone": {
+        "humorous": ["funny", "humor", "humorous", "witty"],
+        "professional": ["professional", "formal", "corporate"],
+        "casual": ["casual", "friendly", "conversational"]
+    },
+    "technique": {
+        "storytelling": ["story", "storytelling", "narrative"],
+        "wordplay_and_rhyming": ["rhyme", "catchy", "memorable"],
+        "objection_handling": ["objection", "concern", "worry"]
+    }
+})
+
+
+def _industries_in(text: str) -> tuple:
+    """Every industry with a keyword in text, in INDUSTRY_KEYWORDS order"""
+    return tuple(INDUSTRY_MATCHER.scan(text)["industry"])
+
+
+class CopyHistory:
+    """
+    One conversation's recent messages, as a fixed-size ring buffer
+    
+    Industry keyword hits are counted as messages enter and leave the
+    buffer, so detection never re-reads the history text.
+    """
+    
+    def __init__(self, max_messages: int):
+        self.messages: deque = deque(maxlen=max_messages)
+        self.industry_counts: Dict[str, int] = {}
+    
+    def append(self, role: str, content: str):
+        if len(self.messages) == self.messages.maxlen:
+            for industry in self.messages[0]["industries"]:
+                self.industry_counts[industry] -= 1
+        industries = _industries_in(content)
+        self.messages.append({"role": role, "content": content, "industries": industries})
+        for industry in industries:
+            self.industry_counts[industry] = self.industry_counts.get(industry, 0) + 1
+    
+    def mentions(self, industry: str) -> bool:
+        return self.industry_counts.get(industry, 0) > 0
+
 
 class CopyBot:
     """Professional copywriting agent - creates dynamic, context-aware long-form content"""
@@ -16,7 +99,8 @@ class CopyBot:
         self.status = "idle"
        
         self.hf_token = os.getenv("HF_TOKEN")
-        self.api_url = "https://api-inference.huggingface.co/models/"
+        # Point HF_API_BASE_URL at mock_inference.py to run without HF quota
+        self.api_url = os.getenv("HF_API_BASE_URL", "https://api-inference.huggingface.co/models/").rstrip("/") + "/"
         self.model_name = "meta-llama/Llama-3.2-3B-Instruct"
        
         # Industry-specific copy templates and approaches
@@ -25,12 +109,24 @@ class CopyBot:
         # Copywriting best practices from examples
         self.copywriting_techniques = self._load_copywriting_techniques()
        
-        # Conversation history buffer
-        self.conversation_history = []
+        # Recent messages per conversation id, least recently used first
+        self.histories: "OrderedDict[str, CopyHistory]" = OrderedDict()
+        self.history_length = int(os.getenv("COPYBOT_HISTORY_LENGTH", "20"))
+        self.max_histories = int(os.getenv("COPYBOT_HISTORY_CONVERSATIONS", "1000"))
+        self.history_evictions = 0
         
         # User intent tracking
         self.last_intent = None
         self.last_brand_context = {}
+        
+        # Token streaming stats (time-to-first-token is what users feel)
+        self.stream_stats = {
+            "streams": 0,
+            "fallbacks": 0,
+            "first_tokens": 0,
+            "total_ttft": 0.0,
+            "last_ttft_ms": None
+        }
        
         logger.info(f"Initialized {self.name} with dynamic content generation")
    
@@ -132,13 +228,102 @@ class CopyBot:
             }
         }
     
-    async def _query_model(self, prompt: str, max_length: int = 2000) -> str:
+    async def _query_model(self, prompt: str, max_length: int = 2000, use_cache: bool = True) -> str:
         """Query the Hugging Face model for dynamic generation"""
         if not self.hf_token:
             logger.warning("HF_TOKEN not set; using template-based generation")
             return self._fallback_smart_response(prompt)
         
+        key = self._response_cache_key(prompt, max_length)
+        if use_cache:
+            cached = await copy_cache.get(key)
+            if cached is not None:
+                logger.info(f"{self.name} response cache hit")
+                return cached.decode()
+        
+        async def generate() -> Optional[str]:
+            breaker = breakers.get(self.model_name)
+            if not breaker.allow():
+                logger.info(f"{self.name} circuit open for {self.model_name}, using templates")
+                return None
+            
+            try:
+                text = await self._call_model(prompt, max_length)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except AdmissionTimeout as e:
+                # Our own queue is full; that says nothing about the endpoint
+                breaker.release()
+                logger.warning(f"{self.name} could not get a model slot: {e}")
+                return None
+            except Exception:
+                # Every admitted call must report back, or a half-open probe slot leaks
+                breaker.record_failure()
+                raise
+            
+            if text is None:
+                breaker.record_failure()
+                return None
+            
+            breaker.record_success()
+            await copy_cache.set(key, text.encode())
+            return text
+        
+        # Identical concurrent requests share one model call
+        text = await text_flight.do(key, generate)
+        if text is None:
+            # Template fallbacks are never cached as if they were model output
+            return self._fallback_smart_response(prompt)
+        
+        return text
+    
+    async def _call_model(self, prompt: str, max_length: int) -> Optional[str]:
+        """
+        One text-generation request; returns None if the model gave no usable output
+        
+        AdmissionTimeout (no local concurrency slot in time) is raised, not
+        swallowed, so it is not mistaken for a model failure.
+        """
         headers = {"Authorization": f"Bearer {self.hf_token}"}
+        payload = self._generation_payload(prompt, max_length)
+        
+        url = f"{self.api_url}{self.model_name}"
+        limiter = limiters.get(self.model_name)
+        
+        async def send(timeout: float):
+            # Admission is per attempt, so retry backoff never holds a slot
+            started = time.monotonic()
+            async with limiter.slot(timeout):
+                remaining = timeout - (time.monotonic() - started)
+                return await http_pool.post(url, headers=headers, json=payload, timeout=max(remaining, 1.0))
+        
+        try:
+            response = await text_retry.run(send, label=self.model_name)
+            response.raise_for_status()
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0 and "generated_text" in result[0]:
+                return result[0]["generated_text"].strip()
+            else:
+                logger.warning("Unexpected model response format")
+                return None
+        except AdmissionTimeout:
+            raise
+        except Exception as e:
+            logger.error(f"Model query failed: {e}")
+            return None
+    
+    def _response_cache_key(self, prompt: str, max_length: int) -> str:
+        """Cache key over the whitespace-normalized prompt and generation parameters"""
+        normalized = " ".join(prompt.split())
+        return make_cache_key(
+            self.model_name,
+            normalized,
+            self._generation_payload("", max_length)["parameters"]
+        )
+    
+    def _generation_payload(self, prompt: str, max_length: int, stream: bool = False) -> Dict[str, Any]:
+        """Build the text-generation request body"""
         payload = {
             "inputs": prompt,
             "parameters": {
@@ -149,25 +334,133 @@ class CopyBot:
                 "return_full_text": False
             }
         }
+        if stream:
+            payload["stream"] = True
+        return payload
+    
+    async def _stream_model(
+        self,
+        prompt: str,
+        max_length: int = 2000,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream tokens from the Hugging Face model as they are generated
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.api_url}{self.model_name}",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
+        Yields {"type": "token", "text": ...} events, then one
+        {"type": "done", "content": ...} event. If the stream fails at any
+        point it yields {"type": "fallback", "content": ...} with the template
+        response instead, which replaces any tokens already sent.
+        
+        Opening the stream goes through text_retry like _call_model, so a
+        transient 503 or 429 before the first token is retried. The model's
+        limiter slot is held only until the response headers arrive; open
+        streams are bounded by the host's connection pool instead, so a slow
+        stream doesn't hold up admission for other calls to the model.
+        """
+        if not self.hf_token:
+            logger.warning("HF_TOKEN not set; using template-based generation")
+            yield {"type": "fallback", "content": self._fallback_smart_response(prompt)}
+            return
+        
+        key = self._response_cache_key(prompt, max_length)
+        if use_cache:
+            cached = await copy_cache.get(key)
+            if cached is not None:
+                content = cached.decode()
+                yield {"type": "token", "text": content}
+                yield {"type": "done", "content": content}
+                return
+        
+        breaker = breakers.get(self.model_name)
+        if not breaker.allow():
+            logger.info(f"{self.name} circuit open for {self.model_name}, using templates")
+            yield {"type": "fallback", "content": self._fallback_smart_response(prompt)}
+            return
+        
+        headers = {"Authorization": f"Bearer {self.hf_token}"}
+        payload = self._generation_payload(prompt, max_length, stream=True)
+        url = f"{self.api_url}{self.model_name}"
+        limiter = limiters.get(self.model_name)
+        # Holds the open response of the attempt that succeeded
+        stream = AsyncExitStack()
+        
+        async def connect(timeout: float):
+            # The slot is released once the headers arrive, not held for the tokens
+            started = time.monotonic()
+            async with limiter.slot(timeout):
+                remaining = timeout - (time.monotonic() - started)
+                response = await stream.enter_async_context(http_pool.stream(
+                    "POST", url, headers=headers, json=payload, timeout=max(remaining, 1.0)
+                ))
+                if response.status_code >= 400:
+                    # Error bodies are small; the retry policy reads 503 load estimates from them
+                    try:
+                        await response.aread()
+                    finally:
+                        await stream.aclose()
+                return response
+        
+        tokens: List[str] = []
+        started = time.perf_counter()
+        self.stream_stats["streams"] += 1
+        
+        try:
+            async with stream:
+                response = await text_retry.run(connect, label=self.model_name)
                 response.raise_for_status()
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0 and "generated_text" in result[0]:
-                    return result[0]["generated_text"].strip()
-                else:
-                    logger.warning("Unexpected model response format")
-                    return self._fallback_smart_response(prompt)
-            except Exception as e:
-                logger.error(f"Model query failed: {e}")
-                return self._fallback_smart_response(prompt)
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    chunk = json.loads(data)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    
+                    token = chunk.get("token") or {}
+                    if token.get("special") or not token.get("text"):
+                        continue
+                    
+                    if not tokens:
+                        self._record_first_token(time.perf_counter() - started)
+                    tokens.append(token["text"])
+                    yield {"type": "token", "text": token["text"]}
+            
+            content = "".join(tokens).strip()
+            if not content:
+                raise RuntimeError("stream ended without tokens")
+            
+        except AdmissionTimeout as e:
+            # Our own queue is full before any token was sent; the model is fine
+            logger.warning(f"{self.name} could not get a model slot: {e}")
+            breaker.release()
+            self.stream_stats["fallbacks"] += 1
+            yield {"type": "fallback", "content": self._fallback_smart_response(prompt)}
+            return
+        except Exception as e:
+            logger.error(f"Model stream failed after {len(tokens)} tokens: {e}")
+            breaker.record_failure()
+            self.stream_stats["fallbacks"] += 1
+            yield {"type": "fallback", "content": self._fallback_smart_response(prompt)}
+            return
+        except BaseException:
+            # Client went away mid-stream; that says nothing about the model
+            breaker.release()
+            raise
+        
+        breaker.record_success()
+        await copy_cache.set(key, content.encode())
+        yield {"type": "done", "content": content}
+    
+    def _record_first_token(self, elapsed: float):
+        """Track time-to-first-token across streams"""
+        stats = self.stream_stats
+        stats["first_tokens"] += 1
+        stats["total_ttft"] += elapsed
+        stats["last_ttft_ms"] = round(elapsed * 1000, 1)
     
     def _fallback_smart_response(self, prompt: str) -> str:
         """Smart fallback when model is unavailable - generates structured template"""
@@ -194,87 +487,69 @@ class CopyBot:
             "techniques": []
         }
         
-        prompt_lower = prompt.lower()
+        hits = INTENT_KEYWORDS.scan(prompt)
         
         # Detect copy type
-        if any(word in prompt_lower for word in ["landing page", "homepage", "web page"]):
-            intent["copy_type"] = "landing_page"
-        elif any(word in prompt_lower for word in ["email", "newsletter", "campaign"]):
-            intent["copy_type"] = "email"
-        elif any(word in prompt_lower for word in ["headline", "slogan", "tagline"]):
-            intent["copy_type"] = "headline"
-        elif any(word in prompt_lower for word in ["product description", "product page"]):
-            intent["copy_type"] = "product_description"
-        elif any(word in prompt_lower for word in ["about", "about us", "company"]):
-            intent["copy_type"] = "about_page"
-        elif any(word in prompt_lower for word in ["faq", "questions"]):
-            intent["copy_type"] = "faq"
+        if hits["copy_type"]:
+            intent["copy_type"] = hits["copy_type"][0]
         
         # Detect industry
-        for industry in self.industry_frameworks.keys():
-            if industry in prompt_lower:
-                intent["industry"] = industry
-                break
+        if hits["industry"]:
+            intent["industry"] = hits["industry"][0]
         
         # Detect tone preferences
-        if any(word in prompt_lower for word in ["funny", "humor", "humorous", "witty"]):
-            intent["tone"] = "humorous"
-            intent["techniques"].append("humor")
-        elif any(word in prompt_lower for word in ["professional", "formal", "corporate"]):
-            intent["tone"] = "professional"
-        elif any(word in prompt_lower for word in ["casual", "friendly", "conversational"]):
-            intent["tone"] = "casual"
+        if hits["tone"]:
+            intent["tone"] = hits["tone"][0]
+            if intent["tone"] == "humorous":
+                intent["techniques"].append("humor")
         
         # Detect specific techniques requested
-        if any(word in prompt_lower for word in ["story", "storytelling", "narrative"]):
-            intent["techniques"].append("storytelling")
-        if any(word in prompt_lower for word in ["rhyme", "catchy", "memorable"]):
-            intent["techniques"].append("wordplay_and_rhyming")
-        if any(word in prompt_lower for word in ["objection", "concern", "worry"]):
-            intent["techniques"].append("objection_handling")
+        intent["techniques"].extend(hits["technique"])
         
         return intent
    
-    def update_conversation_history(self, role: str, content: str):
-        """Update the conversation history buffer"""
-        self.conversation_history.append({"role": role, "content": content})
-        # Keep only last 20 exchanges to avoid token limits
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
+    def _history(self, conversation_id: Optional[str]) -> CopyHistory:
+        """
+        History for a conversation, created on first use
+        
+        Without a conversation id the history lives for one request only,
+        so unrelated callers never see each other's messages.
+        """
+        if conversation_id is None:
+            return CopyHistory(self.history_length)
+        
+        history = self.histories.get(conversation_id)
+        if history is None:
+            history = self.histories[conversation_id] = CopyHistory(self.history_length)
+            if len(self.histories) > self.max_histories:
+                self.histories.popitem(last=False)
+                self.history_evictions += 1
+        else:
+            self.histories.move_to_end(conversation_id)
+        return history
+    
+    def update_conversation_history(self, role: str, content: str, conversation_id: Optional[str] = None):
+        """Update a conversation's history buffer (oldest messages drop off)"""
+        self._history(conversation_id).append(role, content)
     
-    def _detect_industry(self, brand_name: str, context: Dict[str, Any]) -> str:
+    def _detect_industry(self, brand_name: str, context: Dict[str, Any], history: Optional[CopyHistory] = None) -> str:
         """Enhanced industry detection using multiple signals"""
-        history_text = " ".join([msg["content"] for msg in self.conversation_history]).lower()
-        text = f"{brand_name} {context.get('industry', '')} {context.get('user_prompt', '')} {context.get('product_description', '')} {history_text}".lower()
-       
-        # Industry detection with expanded keywords
-        industry_keywords = {
-            "fintech": ['bank', 'finance', 'payment', 'fintech', 'crypto', 'wallet', 'investment', 
-                       'trading', 'loan', 'credit', 'insurance', 'wealth'],
-            "saas": ['software', 'saas', 'platform', 'tool', 'app', 'productivity', 'cloud', 
-                    'devops', 'crm', 'analytics', 'automation', 'workflow'],
-            "ecommerce": ['shop', 'store', 'ecommerce', 'retail', 'product', 'clothing', 'fashion', 
-                         'marketplace', 'boutique', 'apparel', 'accessories'],
-            "healthcare": ['health', 'medical', 'wellness', 'care', 'fitness', 'hospital', 'pharma',
-                          'clinic', 'therapy', 'diagnosis', 'patient'],
-            "education": ['education', 'learning', 'course', 'training', 'school', 'university', 
-                         'edtech', 'student', 'teacher', 'curriculum'],
-            "tech": ['tech', 'ai', 'machine learning', 'data', 'hardware', 'gadget', 'innovation',
-                    'semiconductor', 'iot', 'robotics']
-        }
+        text = f"{brand_name} {context.get('industry', '')} {context.get('user_prompt', '')} {context.get('product_description', '')}"
+        found = _industries_in(text)
         
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in text for keyword in keywords):
+        for industry in INDUSTRY_KEYWORDS:
+            if (history and history.mentions(industry)) or industry in found:
                 return industry
         
         return "saas"  # Default
    
-    def _summarize_conversation_history(self) -> str:
+    def _summarize_conversation_history(self, history: CopyHistory) -> str:
         """Summarize recent conversation history for context injection"""
-        if not self.conversation_history:
+        if not history.messages:
             return ""
         
-        user_msgs = [msg["content"] for msg in self.conversation_history[-10:] if msg["role"] == "user"]
+        recent_msgs = list(history.messages)[-10:]
+        user_msgs = [msg["content"] for msg in recent_msgs if msg["role"] == "user"]
         if not user_msgs:
             return ""
         
@@ -316,15 +591,13 @@ class CopyBot:
         self,
         user_prompt: str,
         brand_name: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        intent: Dict[str, Any],
+        industry: str,
+        history: CopyHistory
     ) -> str:
         """Build an intelligent prompt based on user request and context"""
         
-        # Parse intent from user prompt
-        intent = self._parse_intent_from_prompt(user_prompt)
-        
-        # Detect industry
-        industry = self._detect_industry(brand_name, context)
         framework = self.industry_frameworks[industry]
         
         # Get relevant copywriting techniques
@@ -335,7 +608,7 @@ class CopyBot:
         ])
         
         # Get conversation context
-        history_summary = self._summarize_conversation_history()
+        history_summary = self._summarize_conversation_history(history)
         
         # Build comprehensive prompt
         copy_type = intent.get("copy_type", "general")
@@ -484,28 +757,85 @@ Create copy that would make the reader stop scrolling and take action."""
         brand = brand_name or ctx.get("brand_name", "Your Brand")
         
         # Store the original prompt
-        self.update_conversation_history("user", user_prompt)
+        history = self._history(ctx.get("conversation_id"))
+        history.append("user", user_prompt)
+        
+        # Intent and industry are worked out once per request
+        intent = self._parse_intent_from_prompt(user_prompt)
+        industry = self._detect_industry(brand, ctx, history)
         
         # Build smart prompt
-        full_prompt = self._build_smart_prompt(user_prompt, brand, ctx)
+        full_prompt = self._build_smart_prompt(user_prompt, brand, ctx, intent, industry, history)
         
         logger.info(f"{self.name} generating copy for prompt: {user_prompt[:100]}...")
         
         # Generate content
-        content = await self._query_model(full_prompt, max_length=3000)
+        content = await self._query_model(
+            full_prompt,
+            max_length=3000,
+            use_cache=not ctx.get("bypass_cache", False)
+        )
         
-        # Store in history
-        self.update_conversation_history("assistant", content)
+        return self._build_copy_result(brand, content, intent, industry, history)
+    
+    async def stream_copy_from_prompt(
+        self,
+        user_prompt: str,
+        brand_name: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of generate_copy_from_prompt
+        
+        Yields the token / fallback events from _stream_model, then a final
+        {"type": "result", ...} event shaped like generate_copy_from_prompt's return.
+        """
         
-        # Parse intent for metadata
+        ctx = context or {}
+        brand = brand_name or ctx.get("brand_name", "Your Brand")
+        
+        history = self._history(ctx.get("conversation_id"))
+        history.append("user", user_prompt)
         intent = self._parse_intent_from_prompt(user_prompt)
+        industry = self._detect_industry(brand, ctx, history)
+        full_prompt = self._build_smart_prompt(user_prompt, brand, ctx, intent, industry, history)
+        
+        logger.info(f"{self.name} streaming copy for prompt: {user_prompt[:100]}...")
+        
+        content = ""
+        async for event in self._stream_model(
+            full_prompt,
+            max_length=3000,
+            use_cache=not ctx.get("bypass_cache", False)
+        ):
+            if event["type"] == "done":
+                content = event["content"]
+                continue
+            if event["type"] == "fallback":
+                content = event["content"]
+            yield event
+        
+        yield {"type": "result", **self._build_copy_result(brand, content, intent, industry, history)}
+    
+    def _build_copy_result(
+        self,
+        brand: str,
+        content: str,
+        intent: Dict[str, Any],
+        industry: str,
+        history: CopyHistory
+    ) -> Dict[str, Any]:
+        """Record generated copy in history and package it with metadata"""
+        
+        # Store in history
+        history.append("assistant", content)
         
         return {
             "copy_type": intent.get("copy_type", "general"),
             "content": content,
             "brand_name": brand,
-            "industry": self._detect_industry(brand, ctx),
-            "techniques_used": self._select_copywriting_techniques(intent, self._detect_industry(brand, ctx)),
+            "industry": industry,
+            "techniques_used": self._select_copywriting_techniques(intent, industry),
             "metadata": {
                 "word_count": len(content.split()),
                 "intent": intent,
@@ -779,7 +1109,22 @@ Remember: Great copy understands the audience, addresses real pain points, and m
             "specialty": self.specialty,
             "status": self.status,
             "model": self.model_name,
-            "history_length": len(self.conversation_history),
+            "circuit_breaker": breakers.get(self.model_name).get_stats(),
+            "histories": {
+                "conversations": len(self.histories),
+                "max_conversations": self.max_histories,
+                "messages_per_conversation": self.history_length,
+                "evictions": self.history_evictions
+            },
+            "response_cache": copy_cache.get_stats(),
+            "streaming": {
+                "streams": self.stream_stats["streams"],
+                "fallbacks": self.stream_stats["fallbacks"],
+                "avg_ttft_ms": round(
+                    self.stream_stats["total_ttft"] / self.stream_stats["first_tokens"] * 1000, 1
+                ) if self.stream_stats["first_tokens"] else None,
+                "last_ttft_ms": self.stream_stats["last_ttft_ms"]
+            },
             "supported_copy_types": [
                 "landing_page", "email", "headline", "product_description",
                 "about_page", "faq", "pitch_deck", "general"
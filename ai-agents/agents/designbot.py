@@ -3,14 +3,27 @@ Enhanced DesignBot - Professional Logo & Graphic Design Agent
 Uses state-of-the-art image generation models
 """
 import os
+import time
 import base64
-import httpx
 from io import BytesIO
-from typing import Dict, Any, Optional
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+from typing import Dict, Any, Optional, Tuple
+from collections import deque
+from PIL import Image
 from loguru import logger
 import asyncio
 
+from services.http_pool import http_pool
+from services.cache import logo_cache, make_cache_key
+from services.singleflight import image_flight
+from services.circuit_breaker import breakers
+from services.retry import image_retry, RetryExhausted
+from services.rate_limit import limiters, AdmissionTimeout
+from services.executor import image_executor
+from services.artifacts import artifact_store, inline_by_default
+from services.image_codecs import default_output, media_type, FORMATS
+from services.postprocess import PostProcessChain, postprocess_metrics, DEFAULT_CHAIN
+from services.rendering import process_generated, render_placeholder
+
 class DesignBot:
     """AI Agent for professional logo and graphic design"""
     
@@ -21,13 +34,49 @@ class DesignBot:
         self.status = "idle"
         
         self.hf_token = os.getenv("HF_TOKEN")
-        self.api_url = "https://api-inference.huggingface.co/models/"
+        # Point HF_API_BASE_URL at mock_inference.py to run without HF quota
+        self.api_url = os.getenv("HF_API_BASE_URL", "https://api-inference.huggingface.co/models/").rstrip("/") + "/"
         
         # Use best free models on HuggingFace
         self.models = {
             "primary": "black-forest-labs/FLUX.1-schnell",  # Fast, high quality
             "fallback": "stabilityai/stable-diffusion-xl-base-1.0"  # Backup
         }
+        self.model_labels = {
+            "primary": "FLUX.1-schnell",
+            "fallback": "SDXL"
+        }
+        
+        # Recent successful call latencies per model, for hedging decisions
+        self.latencies = {model: deque(maxlen=200) for model in self.models.values()}
+        
+        # Opt-in hedging: fire the fallback when the primary is in its latency tail
+        self.hedging = {
+            "enabled": os.getenv("DESIGNBOT_HEDGING", "false").lower() == "true",
+            "percentile": float(os.getenv("DESIGNBOT_HEDGE_PERCENTILE", "95")),
+            "min_samples": int(os.getenv("DESIGNBOT_HEDGE_MIN_SAMPLES", "20")),
+            "default_delay": float(os.getenv("DESIGNBOT_HEDGE_DELAY_SECONDS", "20")),
+            "requests": 0,
+            "hedged": 0,
+            "fallback_wins": 0
+        }
+        
+        # Part of a task's deadline kept back from the models, so post-processing
+        # or the placeholder still fits when generation runs long
+        self.deadline_reserve = float(os.getenv("DESIGNBOT_DEADLINE_RESERVE_SECONDS", "10"))
+        
+        # Placeholder layer caches live in services.rendering, in the executor's workers
+        self.placeholder_stats = {"renders": 0, "encoded_hits": 0, "background_hits": 0, "glyph_hits": 0}
+        
+        # Post-processing chain per model tier; FLUX output rarely needs
+        # enhancing, so its default is resize-only. With no pixel stages,
+        # output within the resize edge that already matches the requested
+        # format is served byte-for-byte.
+        self.postprocess = {
+            "primary": PostProcessChain.parse(os.getenv("DESIGNBOT_POSTPROCESS_PRIMARY", "resize:1024")),
+            "fallback": PostProcessChain.parse(os.getenv("DESIGNBOT_POSTPROCESS_FALLBACK", DEFAULT_CHAIN))
+        }
+        self.pipeline_stats = {"passthrough": 0, "reencoded": 0}
         
         logger.info(f"Initialized {self.name} with FLUX.1-schnell")
     
@@ -43,10 +92,24 @@ class DesignBot:
         Args:
             brand_name: The brand name for the logo
             style: Design style (modern, vintage, tech, etc.)
-            context: Additional context like colors, industry, mood
+            context: Additional context like colors, industry, mood;
+                bypass_cache=True forces a fresh generation,
+                image_output selects format/effort/sizes (see
+                services.image_codecs), inline_images=True also
+                embeds the full-size image as a data URI, and deadline
+                (a time.monotonic() time) bounds the whole call: the
+                model tiers share what is left of it, minus
+                deadline_reserve, before falling back to the placeholder
+        
+        Encoded images go to the artifact store; the result carries their
+        artifact ids rather than the bytes.
         """
         
         ctx = context or {}
+        use_cache = not ctx.get("bypass_cache", False)
+        deadline = ctx.get("deadline")
+        end = deadline - self.deadline_reserve if deadline is not None else None
+        output = ctx.get("image_output") or default_output()
         
         # Extract context
         colors = ctx.get("colors", ["purple", "cyan"])
@@ -61,57 +124,143 @@ class DesignBot:
         
         try:
             if self.hf_token:
-                # Try primary model first
-                image_bytes = await self._call_hf_image_api(
-                    prompt, 
-                    negative_prompt, 
-                    model=self.models["primary"]
-                )
-                
-                if image_bytes:
-                    img = Image.open(BytesIO(image_bytes))
-                    
-                    # Post-process for better quality
-                    img = self._enhance_image(img)
-                    
-                    img_base64 = self._image_to_base64(img)
-                    
-                    logger.success(f"{self.name} generated professional logo via FLUX.1")
-                    return {
-                        "image_base64": f"data:image/png;base64,{img_base64}",
-                        "format": "PNG",
-                        "size": img.size,
-                        "brand_name": brand_name,
-                        "model_used": "FLUX.1-schnell"
-                    }
-                
-                # Try fallback model
-                logger.info(f"{self.name} trying fallback model")
-                image_bytes = await self._call_hf_image_api(
-                    prompt,
-                    negative_prompt,
-                    model=self.models["fallback"]
-                )
+                generate = self._generate_hedged if self.hedging["enabled"] else self._generate_in_order
+                try:
+                    image_bytes, tier = await asyncio.wait_for(
+                        generate(prompt, negative_prompt, use_cache, end),
+                        timeout=max(0.0, end - time.monotonic()) if end is not None else None
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"{self.name} model tiers ran out of time, using enhanced placeholder")
+                    image_bytes = None
                 
                 if image_bytes:
-                    img = Image.open(BytesIO(image_bytes))
-                    img = self._enhance_image(img)
-                    img_base64 = self._image_to_base64(img)
+                    model_used = self.model_labels[tier]
+                    chain = self.postprocess[tier]
+                    size = self._passthrough_size(image_bytes, output, chain)
+                    if size is None:
+                        # Decode, post-process and encode off the event loop
+                        variants, size, report = await image_executor.run(
+                            process_generated, image_bytes, output, chain
+                        )
+                        self.pipeline_stats["reencoded"] += 1
+                    else:
+                        # Serve the model's bytes as-is; only smaller sizes are encoded
+                        variants = {}
+                        if any(edge < max(size) for edge in output["sizes"]):
+                            variants, _, _ = await image_executor.run(
+                                process_generated, image_bytes, output, chain, True
+                            )
+                        variants[max(size)] = image_bytes
+                        report = {"timings": {}, "skipped": list(chain.steps)}
+                        self.pipeline_stats["passthrough"] += 1
+                    postprocess_metrics.record(model_used, report)
                     
-                    logger.success(f"{self.name} generated logo via SDXL fallback")
-                    return {
-                        "image_base64": f"data:image/png;base64,{img_base64}",
-                        "format": "PNG",
-                        "size": img.size,
+                    logger.success(f"{self.name} generated professional logo via {model_used}")
+                    return await self._logo_result(variants, size, output, ctx, {
                         "brand_name": brand_name,
-                        "model_used": "SDXL"
-                    }
+                        "model_used": model_used
+                    })
                     
         except Exception as e:
             logger.warning(f"HF Image API failed: {e}, using enhanced placeholder")
         
         # Create enhanced placeholder if API fails
-        return self._create_professional_logo(brand_name, colors, style)
+        return await self._create_professional_logo(brand_name, colors, style, ctx, output)
+    
+    async def _generate_in_order(
+        self,
+        prompt: str,
+        negative_prompt: str,
+        use_cache: bool,
+        end: Optional[float] = None
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """Try the primary model, then the fallback once it has failed"""
+        
+        image_bytes = await self._generate_image(
+            prompt,
+            negative_prompt,
+            model=self.models["primary"],
+            use_cache=use_cache,
+            end=end
+        )
+        if image_bytes:
+            return image_bytes, "primary"
+        
+        logger.info(f"{self.name} trying fallback model")
+        image_bytes = await self._generate_image(
+            prompt,
+            negative_prompt,
+            model=self.models["fallback"],
+            use_cache=use_cache,
+            end=end
+        )
+        return (image_bytes, "fallback") if image_bytes else (None, None)
+    
+    async def _generate_hedged(
+        self,
+        prompt: str,
+        negative_prompt: str,
+        use_cache: bool,
+        end: Optional[float] = None
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Start the primary model; if it is slower than its usual tail latency,
+        fire the fallback alongside it and keep whichever answers first
+        """
+        
+        tiers = {}
+        primary = asyncio.ensure_future(self._generate_image(
+            prompt, negative_prompt, model=self.models["primary"], use_cache=use_cache, end=end
+        ))
+        tiers[primary] = "primary"
+        self.hedging["requests"] += 1
+        
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay())
+            if done:
+                # Primary answered (or failed) before the hedge point: plain fallback order
+                if primary.result():
+                    return primary.result(), "primary"
+                logger.info(f"{self.name} trying fallback model")
+                image_bytes = await self._generate_image(
+                    prompt, negative_prompt, model=self.models["fallback"], use_cache=use_cache, end=end
+                )
+                return (image_bytes, "fallback") if image_bytes else (None, None)
+            
+            logger.info(f"{self.name} primary is slow, hedging with fallback model")
+            self.hedging["hedged"] += 1
+            fallback = asyncio.ensure_future(self._generate_image(
+                prompt, negative_prompt, model=self.models["fallback"], use_cache=use_cache, end=end
+            ))
+            tiers[fallback] = "fallback"
+            pending.add(fallback)
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary if both land in the same tick
+                for task in sorted(done, key=lambda t: tiers[t] != "primary"):
+                    if task.exception() is None and task.result():
+                        if tiers[task] == "fallback":
+                            self.hedging["fallback_wins"] += 1
+                        return task.result(), tiers[task]
+            
+            return None, None
+            
+        finally:
+            # Cancel the loser; singleflight keeps it alive only if others await it
+            for task in pending:
+                task.cancel()
+    
+    def _hedge_delay(self) -> float:
+        """Observed primary latency at the configured percentile, once there is enough data"""
+        samples = self.latencies[self.models["primary"]]
+        if len(samples) < self.hedging["min_samples"]:
+            return self.hedging["default_delay"]
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedging["percentile"] / 100))
+        return ordered[index]
     
     def _build_smart_prompt(
         self, 
@@ -155,16 +304,9 @@ award-winning design, trending on dribbble, 8k quality, masterpiece"""
 watermark, text overlay, signature, complex background, cluttered, messy,
 amateur, unprofessional, low resolution, jpeg artifacts, noise"""
     
-    async def _call_hf_image_api(
-        self, 
-        prompt: str, 
-        negative_prompt: str,
-        model: str
-    ) -> Optional[bytes]:
-        """Call HuggingFace Image Generation API with retries"""
-        
-        headers = {"Authorization": f"Bearer {self.hf_token}"}
-        payload = {
+    def _image_payload(self, prompt: str, negative_prompt: str) -> Dict[str, Any]:
+        """Build the image generation request body"""
+        return {
             "inputs": prompt,
             "parameters": {
                 "negative_prompt": negative_prompt,
@@ -172,215 +314,222 @@ amateur, unprofessional, low resolution, jpeg artifacts, noise"""
                 "guidance_scale": 0.0,  # FLUX.1-schnell doesn't need guidance
             }
         }
-        
-        # Try with retries
-        for attempt in range(2):
-            try:
-                async with httpx.AsyncClient(timeout=90.0) as client:
-                    response = await client.post(
-                        f"{self.api_url}{model}",
-                        headers=headers,
-                        json=payload
-                    )
-                    
-                    if response.status_code == 200:
-                        return response.content
-                    
-                    if response.status_code == 503:
-                        # Model is loading, wait and retry
-                        logger.info(f"Model loading, waiting... (attempt {attempt + 1})")
-                        await asyncio.sleep(10)
-                        continue
-                        
-            except Exception as e:
-                logger.error(f"API call failed (attempt {attempt + 1}): {e}")
-                if attempt < 1:
-                    await asyncio.sleep(5)
-        
-        return None
     
-    def _enhance_image(self, img: Image.Image) -> Image.Image:
-        """Post-process image for better quality"""
+    async def _generate_image(
+        self,
+        prompt: str,
+        negative_prompt: str,
+        model: str,
+        use_cache: bool = True,
+        end: Optional[float] = None
+    ) -> Optional[bytes]:
+        """
+        Return raw image bytes for a request, from the logo cache when possible
         
-        try:
-            # Resize to standard logo size if needed
-            if img.size[0] > 1024 or img.size[1] > 1024:
-                img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+        end (time.monotonic()) caps the call's retry deadline.
+        """
+        
+        key = make_cache_key(model, self._image_payload(prompt, negative_prompt))
+        
+        if use_cache:
+            cached = await logo_cache.get(key)
+            if cached:
+                logger.info(f"{self.name} logo cache hit for {model}")
+                return cached
+        
+        async def generate() -> Optional[bytes]:
+            deadline = None
+            if end is not None:
+                deadline = min(image_retry.deadline, end - time.monotonic())
+                if deadline <= 0:
+                    # Checked before the breaker: a call we never make says nothing about the endpoint
+                    logger.warning(f"{self.name} no time left to call {model}, skipping")
+                    return None
             
-            # Enhance sharpness
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(1.2)
+            breaker = breakers.get(model)
+            if not breaker.allow():
+                # Endpoint is known to be down: go straight to the next tier
+                logger.info(f"{self.name} circuit open for {model}, skipping")
+                return None
             
-            # Enhance contrast slightly
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.1)
+            started = time.perf_counter()
+            try:
+                image_bytes = await self._call_hf_image_api(prompt, negative_prompt, model, deadline)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except AdmissionTimeout as e:
+                # Our own queue is full; that says nothing about the endpoint
+                breaker.release()
+                logger.warning(f"{self.name} could not get a {model} slot: {e}")
+                return None
+            except Exception:
+                # Every admitted call must report back, or a half-open probe slot leaks
+                breaker.record_failure()
+                raise
             
-            return img
+            if not image_bytes:
+                breaker.record_failure()
+                return None
             
-        except Exception as e:
-            logger.warning(f"Image enhancement failed: {e}")
-            return img
+            breaker.record_success()
+            self.latencies[model].append(time.perf_counter() - started)
+            # Store even when bypassing, so a forced regeneration refreshes the entry
+            await logo_cache.set(key, image_bytes)
+            return image_bytes
+        
+        # Identical concurrent requests (double submits, popular prompts) share one call
+        return await image_flight.do(key, generate)
     
-    def _create_professional_logo(
+    async def _call_hf_image_api(
         self, 
-        brand_name: str, 
-        colors: list,
-        style: str
-    ) -> Dict[str, Any]:
-        """Create a professional-looking placeholder logo"""
+        prompt: str, 
+        negative_prompt: str,
+        model: str,
+        deadline: Optional[float] = None
+    ) -> Optional[bytes]:
+        """
+        Call HuggingFace Image Generation API with retries, within deadline seconds if given
         
-        # Create high-res image
-        img = Image.new('RGB', (1024, 1024), color='white')
-        draw = ImageDraw.Draw(img)
+        Returns None if the endpoint gave no image; raises AdmissionTimeout
+        if no local concurrency slot freed up in time.
+        """
         
-        # Parse colors
-        primary = self._parse_color(colors[0] if colors else "#8B5CF6")
-        secondary = self._parse_color(colors[1] if len(colors) > 1 else "#06B6D4")
+        headers = {"Authorization": f"Bearer {self.hf_token}"}
+        payload = self._image_payload(prompt, negative_prompt)
         
-        center = 512
+        url = f"{self.api_url}{model}"
+        limiter = limiters.get(model)
         
-        # Create modern design based on style
-        if "minimal" in style.lower():
-            # Minimalist geometric design
-            self._draw_minimal_logo(draw, center, primary, secondary, brand_name)
-        elif "tech" in style.lower():
-            # Tech-focused design
-            self._draw_tech_logo(draw, center, primary, secondary, brand_name)
-        else:
-            # Default modern design
-            self._draw_modern_logo(draw, center, primary, secondary, brand_name)
+        async def send(timeout: float):
+            # Admission is per attempt, so retry backoff never holds a slot
+            started = time.monotonic()
+            async with limiter.slot(timeout):
+                remaining = timeout - (time.monotonic() - started)
+                return await http_pool.post(url, headers=headers, json=payload, timeout=max(remaining, 1.0))
         
-        # Add brand name
-        self._add_brand_text(draw, brand_name, center, primary)
+        try:
+            # Waits out 503 "model loading" estimates and backs off on other errors
+            response = await image_retry.run(send, label=model, deadline=deadline)
+        except RetryExhausted as e:
+            logger.error(f"Image API call failed: {e}")
+            return None
         
-        img_base64 = self._image_to_base64(img)
+        if response.status_code == 200:
+            return response.content
         
-        logger.info(f"{self.name} generated professional placeholder logo")
-        return {
-            "image_base64": f"data:image/png;base64,{img_base64}",
-            "format": "PNG",
-            "size": (1024, 1024),
-            "brand_name": brand_name,
-            "is_placeholder": True,
-            "style": style
-        }
-    
-    def _draw_minimal_logo(self, draw, center, primary, secondary, brand_name):
-        """Draw minimalist logo"""
-        # Simple circle with gradient effect
-        for i in range(20, 0, -1):
-            radius = i * 10
-            alpha = int(255 * (i / 20))
-            color = self._blend_colors(primary, secondary, i / 20)
-            draw.ellipse(
-                [center - radius, center - radius, center + radius, center + radius],
-                fill=color,
-                outline=None
-            )
-        
-        # Add geometric accent
-        initial = brand_name[0].upper() if brand_name else "B"
-        accent_size = 80
-        draw.rectangle(
-            [center - accent_size, center - accent_size, 
-             center + accent_size, center + accent_size],
-            outline=primary,
-            width=8
-        )
-    
-    def _draw_tech_logo(self, draw, center, primary, secondary, brand_name):
-        """Draw tech-focused logo"""
-        # Hexagonal pattern
-        for i in range(5):
-            radius = 150 - i * 25
-            color = self._blend_colors(primary, secondary, i / 5)
-            
-            # Draw hexagon
-            points = []
-            for angle in range(0, 360, 60):
-                import math
-                x = center + radius * math.cos(math.radians(angle))
-                y = center + radius * math.sin(math.radians(angle))
-                points.append((x, y))
-            
-            draw.polygon(points, fill=color, outline=primary if i == 0 else None)
-    
-    def _draw_modern_logo(self, draw, center, primary, secondary, brand_name):
-        """Draw modern gradient logo"""
-        # Gradient circles
-        for i in range(15, 0, -1):
-            radius = i * 18
-            color = self._blend_colors(primary, secondary, i / 15)
-            draw.ellipse(
-                [center - radius, center - radius, center + radius, center + radius],
-                fill=color,
-                outline=None
-            )
+        logger.error(f"Image API returned {response.status_code} for {model}")
+        return None
     
-    def _add_brand_text(self, draw, brand_name, center, color):
-        """Add brand name to logo"""
-        
-        initial = brand_name[0].upper() if brand_name else "B"
+    def _passthrough_size(
+        self,
+        image_bytes: bytes,
+        output: Dict[str, Any],
+        chain: PostProcessChain
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Size of a generated image that can be served without re-encoding
         
+        Only the header is parsed. Returns None when the chain would change
+        the image or the output needs a different format. Lossless WebP
+        output is always re-encoded since a lossy source can't be told
+        apart cheaply.
+        """
+        if output["format"] == "webp-lossless":
+            return None
         try:
-            # Try to load a good font
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 180)
-        except:
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 180)
-            except:
-                font = ImageFont.load_default()
-        
-        # Calculate text position
-        bbox = draw.textbbox((0, 0), initial, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        text_x = (1024 - text_width) // 2
-        text_y = (1024 - text_height) // 2
-        
-        # Draw with shadow for depth
-        draw.text((text_x + 4, text_y + 4), initial, fill=(0, 0, 0, 80), font=font)
-        draw.text((text_x, text_y), initial, fill='white', font=font)
+            with Image.open(BytesIO(image_bytes)) as probe:
+                source_format, size = probe.format, probe.size
+        except Exception:
+            return None
+        if source_format != FORMATS[output["format"]][0] or not chain.is_noop(size):
+            return None
+        return size
     
-    def _parse_color(self, color: str) -> tuple:
-        """Parse color string to RGB tuple"""
-        
-        color_map = {
-            "purple": (139, 92, 246),
-            "cyan": (6, 182, 212),
-            "blue": (59, 130, 246),
-            "green": (16, 185, 129),
-            "red": (239, 68, 68),
-            "orange": (245, 158, 11),
-            "pink": (236, 72, 153),
-            "brown": (120, 53, 15),
-            "cream": (245, 222, 179),
-            "gold": (234, 179, 8),
-            "silver": (192, 192, 192),
+    async def _logo_result(
+        self,
+        variants: Dict[int, bytes],
+        size: Tuple[int, int],
+        output: Dict[str, Any],
+        ctx: Dict[str, Any],
+        extra: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Store every encoded resolution as an artifact and describe them"""
+        mime = media_type(output)
+        stored = [
+            {
+                "size": edge,
+                "artifact_id": await artifact_store.put(data, mime),
+                "bytes": len(data)
+            }
+            for edge, data in sorted(variants.items(), reverse=True)
+        ]
+        full = stored[0]
+        
+        result = {
+            "artifact_id": full["artifact_id"],
+            "media_type": mime,
+            "bytes": full["bytes"],
+            "format": FORMATS[output["format"]][0],
+            "size": size,
+            "variants": stored,
+            **extra
         }
+        if ctx.get("inline_images", inline_by_default()):
+            # Compatibility: clients that still expect the image inside the JSON
+            data = variants[full["size"]]
+            result["image_base64"] = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+        return result
+    
+    async def _create_professional_logo(
+        self, 
+        brand_name: str, 
+        colors: list,
+        style: str,
+        ctx: Optional[Dict[str, Any]] = None,
+        output: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Create a professional-looking placeholder logo"""
         
-        color_lower = color.lower()
-        if color_lower in color_map:
-            return color_map[color_lower]
+        output = output or default_output()
+        variants, hits = await image_executor.run(render_placeholder, brand_name, colors, style, output)
         
-        if color.startswith("#"):
-            color = color[1:]
-            try:
-                return tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-            except:
-                pass
+        # Hits are reported back because the layer caches live in the worker
+        stats = self.placeholder_stats
+        stats["renders"] += 1
+        stats["encoded_hits"] += hits["encoded"]
+        stats["background_hits"] += hits["background"]
+        stats["glyph_hits"] += hits["glyph"]
         
-        return (139, 92, 246)  # Default purple
+        logger.info(f"{self.name} generated professional placeholder logo")
+        return await self._logo_result(variants, (1024, 1024), output, ctx or {}, {
+            "brand_name": brand_name,
+            "is_placeholder": True,
+            "style": style
+        })
     
-    def _blend_colors(self, color1: tuple, color2: tuple, ratio: float) -> tuple:
-        """Blend two colors smoothly"""
-        return tuple(int(color1[i] * ratio + color2[i] * (1 - ratio)) for i in range(3))
+    def _hedging_stats(self) -> Dict[str, Any]:
+        stats = self.hedging
+        return {
+            "enabled": stats["enabled"],
+            "requests": stats["requests"],
+            "hedged": stats["hedged"],
+            "fallback_wins": stats["fallback_wins"],
+            "hedge_rate": round(stats["hedged"] / stats["requests"], 3) if stats["requests"] else 0.0,
+            "win_rate": round(stats["fallback_wins"] / stats["hedged"], 3) if stats["hedged"] else 0.0,
+            "current_delay_seconds": round(self._hedge_delay(), 2)
+        }
     
-    def _image_to_base64(self, img: Image.Image) -> str:
-        """Convert PIL Image to base64 string"""
-        buffered = BytesIO()
-        img.save(buffered, format="PNG", optimize=True)
-        return base64.b64encode(buffered.getvalue()).decode()
+    def _placeholder_stats(self) -> Dict[str, Any]:
+        stats = self.placeholder_stats
+        renders = stats["renders"]
+        composed = renders - stats["encoded_hits"]
+        return {
+            "renders": renders,
+            "encoded_hit_rate": round(stats["encoded_hits"] / renders, 3) if renders else 0.0,
+            "background_hit_rate": round(stats["background_hits"] / composed, 3) if composed else 0.0,
+            "glyph_hit_rate": round(stats["glyph_hits"] / composed, 3) if composed else 0.0
+        }
     
     def get_status(self) -> Dict[str, Any]:
         return {
@@ -388,7 +537,18 @@ amateur, unprofessional, low resolution, jpeg artifacts, noise"""
             "cost": self.cost,
             "specialty": self.specialty,
             "status": self.status,
-            "model": self.models["primary"]
+            "model": self.models["primary"],
+            "logo_cache": logo_cache.get_stats(),
+            "hedging": self._hedging_stats(),
+            "circuit_breakers": {
+                model: breakers.get(model).get_stats() for model in self.models.values()
+            },
+            "image_executor": image_executor.get_stats(),
+            "placeholders": self._placeholder_stats(),
+            "pipeline": dict(self.pipeline_stats),
+            "postprocess": {
+                self.model_labels[tier]: chain.spec for tier, chain in self.postprocess.items()
+            }
         }
 
 
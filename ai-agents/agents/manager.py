@@ -1,58 +1,302 @@
 """
 Enhanced Manager Agent - Smart orchestration with conversation context
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
+from collections import OrderedDict
 from loguru import logger
+import asyncio
+import json
+import time
+import os
 
 # Import the enhanced agents
 from agents.copybot import copybot
 from agents.designbot import designbot
+from services.conversation_store import Conversation, ConversationStore, Message, create_conversation_store
+from services.keywords import KeywordMatcher
+
+COLORS = [
+    "red", "blue", "green", "yellow", "purple", "orange", "pink",
+    "cyan", "magenta", "brown", "black", "white", "gray", "grey",
+    "gold", "silver", "bronze", "teal", "navy", "maroon", "lime",
+    "indigo", "violet", "turquoise", "coral", "salmon"
+]
+
+# Everything a chat message is scanned for, in one pass; within each group
+# the first category listed wins
+CONTEXT_KEYWORDS = KeywordMatcher({
+    "task": {
+        "design": ['logo', 'design', 'visual', 'graphic', 'image', 'icon', 'brand identity'],
+        "copy": ['slogan', 'copy', 'text', 'tagline', 'campaign', 'write', 'content',
+                 'landing page', 'pitch deck', 'email', 'social', 'headline', 'description']
+    },
+    "style": {
+        "modern": ["modern", "contemporary", "sleek", "clean"],
+        "vintage": ["vintage", "retro", "classic", "old-school"],
+        "tech": ["tech", "digital", "futuristic", "innovative"],
+        "luxury": ["luxury", "premium", "elegant", "sophisticated"],
+        "playful": ["playful", "fun", "energetic", "vibrant"],
+        "minimalist": ["minimal", "simple", "minimalist"],
+        "professional": ["professional", "corporate", "business"]
+    },
+    "color": {color: [color] for color in COLORS},
+    "industry": {
+        "fintech": ["fintech", "finance", "banking", "payment", "crypto", "investment"],
+        "saas": ["saas", "software", "platform", "app", "tool"],
+        "ecommerce": ["ecommerce", "shop", "store", "retail", "product"],
+        "healthcare": ["healthcare", "medical", "health", "wellness", "fitness"],
+        "education": ["education", "learning", "course", "training"],
+        "tech": ["tech", "technology", "ai", "machine learning"]
+    }
+})
+
+# What a direct request (no conversation) needs
+REQUEST_KEYWORDS = KeywordMatcher({
+    "task": {
+        "design": ['logo', 'design', 'visual', 'graphic', 'image', 'icon', 'brand'],
+        "copy": ['slogan', 'copy', 'text', 'tagline', 'campaign', 'write', 'content',
+                 'landing page', 'pitch deck', 'email', 'social']
+    },
+    "copy_type": {
+        "landing_page": ['landing page'],
+        "pitch_deck": ['pitch deck']
+    }
+})
 
 class ConversationManager:
-    """Manages conversation state and context"""
+    """
+    Manages conversation state and context
     
-    def __init__(self):
-        self.conversations: Dict[str, Dict[str, Any]] = {}
+    Bounded: conversations idle longer than the TTL expire, and the least
+    recently used are evicted past a count or approximate byte budget.
+    Only write paths create conversations; reads of unknown ids get None.
     
-    def get_or_create(self, conversation_id: str) -> Dict[str, Any]:
+    With a store, this is a read-through cache in front of it, so any
+    worker can serve any conversation. Cached entries are checked against
+    the store's version token on every read; writes are batched and
+    flushed from a worker thread, off the event loop.
+    """
+    
+    # Per-object overheads for the size estimate, measured with
+    # benchmarks/conversation_memory.py: a slotted Message plus its str
+    # header, and a Conversation with its id, containers and bookkeeping
+    CONVERSATION_OVERHEAD = 512
+    MESSAGE_OVERHEAD = 136
+    
+    def __init__(
+        self,
+        max_conversations: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_ttl: float = 3600,
+        store: Optional[ConversationStore] = None,
+        flush_interval: float = 0.05
+    ):
+        self.max_conversations = max_conversations
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.store = store
+        self.flush_interval = flush_interval
+        self._flusher: Optional[asyncio.Task] = None
+        
+        # Least recently used first
+        self.conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._message_bytes: Dict[str, int] = {}
+        self._state_bytes: Dict[str, int] = {}
+        self._versions: Dict[str, str] = {}
+        self.bytes = 0
+        
+        self.created = 0
+        self.misses = 0
+        self.store_loads = 0
+        self.stale_reloads = 0
+        self.evictions = {"idle": 0, "count": 0, "bytes": 0}
+    
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        """Return conversation state, or None if unknown or expired"""
+        conv = self._lookup(conversation_id)
+        if conv is None:
+            self.misses += 1
+        return conv
+    
+    def get_or_create(self, conversation_id: str) -> Conversation:
         """Get or create conversation state"""
-        if conversation_id not in self.conversations:
-            self.conversations[conversation_id] = {
-                "id": conversation_id,
-                "messages": [],
-                "brand_name": None,
-                "industry": None,
-                "extracted_info": {},
-                "ready_to_execute": False,
-                "analysis": None
-            }
-        return self.conversations[conversation_id]
+        conv = self._lookup(conversation_id)
+        if conv is None:
+            conv = Conversation.new(conversation_id)
+            self._insert(conversation_id, conv)
+            self._save(conversation_id, conv)
+            self.created += 1
+        return conv
     
     def add_message(self, conversation_id: str, role: str, content: str):
         """Add message to conversation history"""
         conv = self.get_or_create(conversation_id)
-        conv["messages"].append({
-            "role": role,
-            "content": content,
-            "timestamp": __import__("time").time()
-        })
+        conv.messages.append(Message(role, content, time.time()))
+        size = len(content) + self.MESSAGE_OVERHEAD
+        self._message_bytes[conversation_id] += size
+        self.bytes += size
+        self._save(conversation_id, conv)
+        self._evict(keep=conversation_id)
     
     def get_context(self, conversation_id: str) -> str:
         """Get conversation context summary"""
-        conv = self.get_or_create(conversation_id)
-        messages = conv["messages"][-5:]  # Last 5 messages
-        return " | ".join([f"{m['role']}: {m['content']}" for m in messages])
+        conv = self.get(conversation_id)
+        if conv is None:
+            return ""
+        messages = conv.messages[-5:]  # Last 5 messages
+        return " | ".join([f"{m.role}: {m.content}" for m in messages])
     
     def update_extracted_info(self, conversation_id: str, info: Dict[str, Any]):
         """Update extracted information"""
         conv = self.get_or_create(conversation_id)
-        conv["extracted_info"].update(info)
+        conv.extracted_info.update(info)
+        self._save(conversation_id, conv)
+        self._resize_state(conversation_id, conv)
     
     def mark_ready(self, conversation_id: str, analysis: Dict[str, Any]):
         """Mark conversation as ready to execute"""
         conv = self.get_or_create(conversation_id)
-        conv["ready_to_execute"] = True
-        conv["analysis"] = analysis
+        conv.ready_to_execute = True
+        conv.analysis = analysis
+        self._save(conversation_id, conv)
+        self._resize_state(conversation_id, conv)
+    
+    async def flush(self):
+        """Write batched changes now, so other workers see them"""
+        if self.store:
+            await asyncio.to_thread(self.store.flush)
+    
+    def delete(self, conversation_id: str) -> bool:
+        """Drop a conversation; returns whether it existed"""
+        existed = conversation_id in self.conversations
+        if existed:
+            self._remove(conversation_id)
+        if self.store:
+            existed = existed or self.store.version(conversation_id) is not None
+            self.store.delete(conversation_id)
+        return existed
+    
+    async def start(self):
+        """Flush batched writes and purge idle conversations in the background"""
+        if self.store and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self):
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self.store:
+            await asyncio.to_thread(self.store.close)
+    
+    async def _flush_loop(self):
+        last_purge = time.time()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.store.flush)
+                if time.time() - last_purge > 60:
+                    last_purge = time.time()
+                    await asyncio.to_thread(self.store.purge, last_purge - self.idle_ttl)
+            except Exception as e:
+                logger.warning(f"Conversation store maintenance failed: {e}")
+    
+    def _lookup(self, conversation_id: str) -> Optional[Conversation]:
+        conv = self.conversations.get(conversation_id)
+        now = time.time()
+        if conv is not None:
+            if self._expired(conversation_id, now):
+                # Idle here, but another worker may have used it since
+                self._remove(conversation_id)
+                self.evictions["idle"] += 1
+            elif self.store and self.store.version(conversation_id) != self._versions.get(conversation_id):
+                # Another worker wrote (or deleted) it since we cached it
+                self._remove(conversation_id)
+                self.stale_reloads += 1
+            else:
+                self._touch(conversation_id)
+                return conv
+        
+        if self.store:
+            found = self.store.load(conversation_id, now - self.idle_ttl)
+            if found is not None:
+                conv, self._versions[conversation_id] = found
+                self.store_loads += 1
+                self._insert(conversation_id, conv)
+                return conv
+        return None
+    
+    def _insert(self, conversation_id: str, conv: Conversation):
+        """Add to the cache as most recently used, with its size estimate"""
+        self.conversations[conversation_id] = conv
+        self._last_used[conversation_id] = time.time()
+        self._message_bytes[conversation_id] = sum(
+            len(m.content) + self.MESSAGE_OVERHEAD for m in conv.messages
+        )
+        self._state_bytes[conversation_id] = 0
+        self.bytes += self._message_bytes[conversation_id]
+        self._resize_state(conversation_id, conv)
+    
+    def _save(self, conversation_id: str, conv: Conversation):
+        if self.store:
+            self._versions[conversation_id] = self.store.save(conversation_id, conv)
+    
+    def _touch(self, conversation_id: str):
+        self.conversations.move_to_end(conversation_id)
+        self._last_used[conversation_id] = time.time()
+    
+    def _expired(self, conversation_id: str, now: float) -> bool:
+        return now - self._last_used[conversation_id] > self.idle_ttl
+    
+    def _resize_state(self, conversation_id: str, conv: Conversation):
+        """Re-estimate the non-message part; only changes on the rarer state updates"""
+        size = self.CONVERSATION_OVERHEAD + len(json.dumps(
+            [conv.extracted_info, conv.analysis], default=str
+        ))
+        self.bytes += size - self._state_bytes[conversation_id]
+        self._state_bytes[conversation_id] = size
+        self._evict(keep=conversation_id)
+    
+    def _remove(self, conversation_id: str):
+        del self.conversations[conversation_id]
+        del self._last_used[conversation_id]
+        self._versions.pop(conversation_id, None)
+        self.bytes -= self._message_bytes.pop(conversation_id) + self._state_bytes.pop(conversation_id)
+    
+    def _evict(self, keep: str):
+        """Expire idle conversations, then evict LRU ones over either bound"""
+        now = time.time()
+        # LRU order is also last-use order, so idle ones are all at the front
+        while self.conversations:
+            oldest = next(iter(self.conversations))
+            if oldest == keep or not self._expired(oldest, now):
+                break
+            self._remove(oldest)
+            self.evictions["idle"] += 1
+        
+        while len(self.conversations) > self.max_conversations or self.bytes > self.max_bytes:
+            oldest = next(iter(self.conversations))
+            if oldest == keep:
+                break
+            reason = "count" if len(self.conversations) > self.max_conversations else "bytes"
+            self._remove(oldest)
+            self.evictions[reason] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "conversations": len(self.conversations),
+            "max_conversations": self.max_conversations,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl,
+            "created": self.created,
+            "misses": self.misses,
+            "evictions": dict(self.evictions),
+            "store_loads": self.store_loads,
+            "stale_reloads": self.stale_reloads,
+            "store": self.store.get_stats() if self.store else {"backend": "memory"}
+        }
 
 
 class ManagerAgent:
@@ -64,7 +308,18 @@ class ManagerAgent:
             "copybot": copybot,
             "designbot": designbot
         }
-        self.conversation_manager = ConversationManager()
+        self.conversation_manager = ConversationManager(
+            max_conversations=int(os.getenv("CONVERSATION_MAX_COUNT", "10000")),
+            max_bytes=int(os.getenv("CONVERSATION_MAX_MB", "64")) * 1024 * 1024,
+            idle_ttl=float(os.getenv("CONVERSATION_IDLE_TTL_SECONDS", "3600")),
+            store=create_conversation_store(),
+            flush_interval=float(os.getenv("CONVERSATION_FLUSH_MS", "50")) / 1000
+        )
+        
+        # Task execution limits
+        self.max_parallel_tasks = max(1, int(os.getenv("MANAGER_MAX_PARALLEL_TASKS", "4")))
+        self.task_timeout = float(os.getenv("MANAGER_TASK_TIMEOUT", "180"))
+        
         logger.info(f"Initialized {self.name} with enhanced conversation handling")
     
     async def handle_chat_message(
@@ -93,13 +348,15 @@ class ManagerAgent:
                 "response": response,
                 "ready_to_execute": False,
                 "conversation_id": conversation_id,
-                "extracted_info": conv["extracted_info"]
+                "extracted_info": conv.extracted_info
             }
         
         elif analysis["has_enough_info"]:
             # We have enough to proceed
-            task_analysis = self.analyze_request(message, conv["extracted_info"])
+            task_analysis = self.analyze_request(message, conv.extracted_info)
             self.conversation_manager.mark_ready(conversation_id, task_analysis)
+            # The follow-up /execute may land on another worker
+            await self.conversation_manager.flush()
             
             response = self._generate_ready_response(task_analysis)
             return {
@@ -107,7 +364,7 @@ class ManagerAgent:
                 "ready_to_execute": True,
                 "conversation_id": conversation_id,
                 "analysis": task_analysis,
-                "extracted_info": conv["extracted_info"]
+                "extracted_info": conv.extracted_info
             }
         
         else:
@@ -122,18 +379,19 @@ class ManagerAgent:
                 "response": response,
                 "ready_to_execute": False,
                 "conversation_id": conversation_id,
-                "extracted_info": conv["extracted_info"]
+                "extracted_info": conv.extracted_info
             }
     
     async def _analyze_with_context(
         self,
         message: str,
-        conv: Dict[str, Any]
+        conv: Conversation
     ) -> Dict[str, Any]:
         """Analyze message with conversation context"""
         
         message_lower = message.lower()
-        extracted = conv["extracted_info"]
+        extracted = conv.extracted_info
+        hits = CONTEXT_KEYWORDS.scan(message_lower)
         
         # Extract information
         new_info = {}
@@ -145,14 +403,8 @@ class ManagerAgent:
                 new_info["brand_name"] = brand
         
         # Detect task type
-        needs_design = any(word in message_lower for word in [
-            'logo', 'design', 'visual', 'graphic', 'image', 'icon', 'brand identity'
-        ])
-        
-        needs_copy = any(word in message_lower for word in [
-            'slogan', 'copy', 'text', 'tagline', 'campaign', 'write', 'content',
-            'landing page', 'pitch deck', 'email', 'social', 'headline', 'description'
-        ])
+        needs_design = "design" in hits["task"]
+        needs_copy = "copy" in hits["task"]
         
         if needs_design:
             new_info["needs_design"] = True
@@ -160,40 +412,16 @@ class ManagerAgent:
             new_info["needs_copy"] = True
         
         # Extract style/tone
-        style_keywords = {
-            "modern": ["modern", "contemporary", "sleek", "clean"],
-            "vintage": ["vintage", "retro", "classic", "old-school"],
-            "tech": ["tech", "digital", "futuristic", "innovative"],
-            "luxury": ["luxury", "premium", "elegant", "sophisticated"],
-            "playful": ["playful", "fun", "energetic", "vibrant"],
-            "minimalist": ["minimal", "simple", "minimalist"],
-            "professional": ["professional", "corporate", "business"]
-        }
-        
-        for style, keywords in style_keywords.items():
-            if any(kw in message_lower for kw in keywords):
-                new_info["style"] = style
-                break
+        if hits["style"]:
+            new_info["style"] = hits["style"][0]
         
         # Extract colors
-        colors = self._extract_colors(message)
-        if colors:
-            new_info["colors"] = colors
+        if hits["color"]:
+            new_info["colors"] = hits["color"][:3]  # Max 3 colors
         
         # Extract industry
-        industry_keywords = {
-            "fintech": ["fintech", "finance", "banking", "payment", "crypto", "investment"],
-            "saas": ["saas", "software", "platform", "app", "tool"],
-            "ecommerce": ["ecommerce", "shop", "store", "retail", "product"],
-            "healthcare": ["healthcare", "medical", "health", "wellness", "fitness"],
-            "education": ["education", "learning", "course", "training"],
-            "tech": ["tech", "technology", "ai", "machine learning"]
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(kw in message_lower for kw in keywords):
-                new_info["industry"] = industry
-                break
+        if hits["industry"]:
+            new_info["industry"] = hits["industry"][0]
         
         # Extract product description
         if " for " in message_lower or " that " in message_lower:
@@ -220,7 +448,7 @@ class ManagerAgent:
         needs_clarification = False
         clarification_reason = None
         
-        if not has_brand and len(conv["messages"]) > 2:
+        if not has_brand and len(conv.messages) > 2:
             needs_clarification = True
             clarification_reason = "brand_name"
         
@@ -240,7 +468,7 @@ class ManagerAgent:
     def _generate_clarification_response(
         self,
         analysis: Dict[str, Any],
-        conv: Dict[str, Any]
+        conv: Conversation
     ) -> str:
         """Generate smart clarification questions"""
         
@@ -250,7 +478,7 @@ class ManagerAgent:
             return "I'd love to help! What's the name of your brand or company?"
         
         elif reason == "task_type":
-            brand = conv["extracted_info"].get("brand_name", "your brand")
+            brand = conv.extracted_info.get("brand_name", "your brand")
             return f"Great! What would you like me to create for {brand}?\n\n• Logo Design (50 HYPER)\n• Copywriting/Slogan (20 HYPER)\n• Landing Page (25 HYPER)\n• Pitch Deck (30 HYPER)\n• Full Brand Package (Logo + Copy)"
         
         else:
@@ -259,11 +487,11 @@ class ManagerAgent:
     def _generate_continuation_response(
         self,
         analysis: Dict[str, Any],
-        conv: Dict[str, Any]
+        conv: Conversation
     ) -> str:
         """Generate response to continue gathering info"""
         
-        extracted = {**conv["extracted_info"], **analysis["extracted_info"]}
+        extracted = {**conv.extracted_info, **analysis["extracted_info"]}
         
         brand = extracted.get("brand_name", "your brand")
         
@@ -321,17 +549,11 @@ class ManagerAgent:
         logger.info(f"Analyzing: {user_prompt}")
         
         info = extracted_info or {}
-        prompt_lower = user_prompt.lower()
+        hits = REQUEST_KEYWORDS.scan(user_prompt)
         
         # Determine what's needed
-        needs_design = info.get("needs_design", False) or any(word in prompt_lower for word in [
-            'logo', 'design', 'visual', 'graphic', 'image', 'icon', 'brand'
-        ])
-        
-        needs_copy = info.get("needs_copy", False) or any(word in prompt_lower for word in [
-            'slogan', 'copy', 'text', 'tagline', 'campaign', 'write', 'content',
-            'landing page', 'pitch deck', 'email', 'social'
-        ])
+        needs_design = info.get("needs_design", False) or "design" in hits["task"]
+        needs_copy = info.get("needs_copy", False) or "copy" in hits["task"]
         
         # Extract brand name
         brand_name = info.get("brand_name") or self._extract_brand_name(user_prompt)
@@ -356,7 +578,7 @@ class ManagerAgent:
         
         if needs_copy:
             # Determine specific copy type
-            if 'landing page' in prompt_lower:
+            if "landing_page" in hits["copy_type"]:
                 tasks.append({
                     "agent": "copybot",
                     "task_type": "landing_page",
@@ -370,7 +592,7 @@ class ManagerAgent:
                     }
                 })
                 total_cost += 25
-            elif 'pitch deck' in prompt_lower:
+            elif "pitch_deck" in hits["copy_type"]:
                 tasks.append({
                     "agent": "copybot",
                     "task_type": "pitch_deck",
@@ -440,112 +662,50 @@ class ManagerAgent:
     async def execute_tasks(
         self,
         analysis: Dict[str, Any],
-        conversation_id: Optional[str] = None
+        conversation_id: Optional[str] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        options: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Execute all analyzed tasks with proper formatting"""
+        """
+        Execute all analyzed tasks concurrently with proper formatting
+        
+        on_event, if given, is called with task_started / task_completed /
+        task_failed events (carrying the task index) as each task progresses.
+        options are per-request settings (e.g. bypass_cache) merged into
+        every task's context, along with conversation_id.
+        """
         
-        logger.info(f"Executing {len(analysis['tasks'])} tasks")
+        tasks = analysis["tasks"]
+        logger.info(f"Executing {len(tasks)} tasks (max {self.max_parallel_tasks} in parallel)")
         
         brand_name = analysis.get("brand_name", "Brand")
-        deliverables = []
+        semaphore = asyncio.Semaphore(self.max_parallel_tasks)
         
-        for task in analysis["tasks"]:
-            agent_name = task["agent"]
-            task_type = task["task_type"]
-            context = task.get("context", {})
-            
-            try:
-                logger.info(f"Running {task_type} with {agent_name}")
-                
-                if task_type == "logo_generation":
-                    result = await designbot.generate_logo(
-                        brand_name=brand_name,
-                        style=context.get("style", "modern minimalist"),
-                        context=context
-                    )
-                    
-                    deliverables.append({
-                        "id": "design",
-                        "type": "image",
-                        "name": f"{brand_name}_Logo",
-                        "content": result["image_base64"],
-                        "agent": "DesignBot",
-                        "metadata": {
-                            "size": result["size"],
-                            "format": result["format"],
-                            "model_used": result.get("model_used", "Generated")
-                        }
-                    })
-                
-                elif task_type == "smart_copy":
-                    # Use the new smart copy generation
-                    result = await copybot.generate_copy_from_prompt(
-                        user_prompt=context.get("user_prompt", "Generate professional copy"),
-                        brand_name=brand_name,
-                        context=context
-                    )
-                    
-                    deliverables.append({
-                        "id": "copy",
-                        "type": "markdown",
-                        "name": f"{brand_name}_{result['copy_type'].title().replace('_', ' ')}",
-                        "content": result["content"],
-                        "agent": "CopyBot",
-                        "metadata": {
-                            "copy_type": result["copy_type"],
-                            "word_count": result["metadata"]["word_count"],
-                            "industry": result["industry"],
-                            "techniques_used": result["techniques_used"]
-                        }
-                    })
-                
-                elif task_type == "landing_page":
-                    page_copy = await copybot.generate_landing_page(
-                        brand_name=brand_name,
-                        product_description=context.get("product_description", "innovative solution"),
-                        context=context
-                    )
-                    
-                    deliverables.append({
-                        "id": "landing_page",
-                        "type": "markdown",
-                        "name": f"{brand_name}_Landing_Page",
-                        "content": page_copy["hero"]["long_form_content"],
-                        "agent": "CopyBot",
-                        "metadata": {
-                            "copy_type": "landing_page",
-                            "sections": ["hero", "features", "testimonials", "cta", "faq"]
-                        }
-                    })
-                
-                elif task_type == "pitch_deck":
-                    deck = await copybot.generate_pitch_deck_copy(
-                        brand_name=brand_name,
-                        context=context
-                    )
-                    
-                    # Format pitch deck nicely
-                    formatted_deck = self._format_pitch_deck(deck, brand_name)
-                    
-                    deliverables.append({
-                        "id": "pitch_deck",
-                        "type": "markdown",
-                        "name": f"{brand_name}_Pitch_Deck",
-                        "content": formatted_deck,
-                        "agent": "CopyBot",
-                        "metadata": {
-                            "copy_type": "pitch_deck",
-                            "slides": len(deck.get("slides", []))
-                        }
-                    })
-                
-                logger.success(f"{task_type} completed")
-                
-            except Exception as e:
-                logger.error(f"Task {task_type} failed: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
+        def emit(event: Dict[str, Any]):
+            if on_event:
+                try:
+                    on_event(event)
+                except Exception as e:
+                    logger.warning(f"Task event handler failed: {e}")
+        
+        # Per-request options, plus the conversation id that scopes CopyBot's history
+        shared = dict(options or {})
+        if conversation_id:
+            shared["conversation_id"] = conversation_id
+        
+        async def run_limited(index: int, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if shared:
+                task = {**task, "context": {**task.get("context", {}), **shared}}
+            async with semaphore:
+                return await self._run_task(index, task, brand_name, emit)
+        
+        # Each task handles its own failures, so one failing never cancels its siblings
+        results = await asyncio.gather(*[
+            run_limited(index, task) for index, task in enumerate(tasks)
+        ])
+        
+        # gather preserves input order, keeping deliverables deterministic
+        deliverables = [deliverable for deliverable in results if deliverable]
         
         return {
             "deliverables": deliverables,
@@ -554,6 +714,157 @@ class ManagerAgent:
             "status": "completed" if deliverables else "failed"
         }
     
+    async def _run_task(
+        self,
+        index: int,
+        task: Dict[str, Any],
+        brand_name: str,
+        emit: Callable[[Dict[str, Any]], None]
+    ) -> Optional[Dict[str, Any]]:
+        """Run a single task with a timeout; returns None if it fails"""
+        
+        task_type = task["task_type"]
+        base_event = {"index": index, "task_type": task_type, "agent": task["agent"]}
+        
+        # One deadline for the whole task; agents with several model tiers
+        # split what is left of it instead of each tier taking its own
+        task = {**task, "context": {**task.get("context", {}), "deadline": time.monotonic() + self.task_timeout}}
+        
+        try:
+            logger.info(f"Running {task_type} with {task['agent']}")
+            emit({"event": "task_started", **base_event})
+            deliverable = await asyncio.wait_for(
+                self._build_deliverable(task, brand_name),
+                timeout=self.task_timeout
+            )
+            logger.success(f"{task_type} completed")
+            if deliverable:
+                emit({"event": "task_completed", **base_event, "deliverable": deliverable})
+            else:
+                emit({"event": "task_failed", **base_event, "error": f"Unknown task type: {task_type}"})
+            return deliverable
+            
+        except asyncio.TimeoutError:
+            logger.error(f"Task {task_type} timed out after {self.task_timeout}s")
+            emit({"event": "task_failed", **base_event, "error": "timeout"})
+        except Exception as e:
+            logger.error(f"Task {task_type} failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            emit({"event": "task_failed", **base_event, "error": str(e)})
+        return None
+    
+    async def _build_deliverable(
+        self,
+        task: Dict[str, Any],
+        brand_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Call the worker agent for a task and format its deliverable"""
+        
+        task_type = task["task_type"]
+        context = task.get("context", {})
+        deliverable = None
+        
+        if task_type == "logo_generation":
+            result = await designbot.generate_logo(
+                brand_name=brand_name,
+                style=context.get("style", "modern minimalist"),
+                context=context
+            )
+            
+            # Served from /artifacts; artifact_base_url makes the links absolute
+            artifacts = f"{context.get('artifact_base_url', '').rstrip('/')}/artifacts"
+            url = f"{artifacts}/{result['artifact_id']}"
+            
+            deliverable = {
+                "id": "design",
+                "type": "image",
+                "name": f"{brand_name}_Logo",
+                "content": result.get("image_base64") or url,
+                "agent": "DesignBot",
+                "metadata": {
+                    "size": result["size"],
+                    "format": result["format"],
+                    "model_used": result.get("model_used", "Generated"),
+                    "url": url,
+                    "artifact_id": result["artifact_id"],
+                    "media_type": result["media_type"],
+                    "bytes": result["bytes"],
+                    "variants": [
+                        {
+                            "size": variant["size"],
+                            "url": f"{artifacts}/{variant['artifact_id']}",
+                            "bytes": variant["bytes"]
+                        }
+                        for variant in result["variants"]
+                    ]
+                }
+            }
+        
+        elif task_type == "smart_copy":
+            # Use the new smart copy generation
+            result = await copybot.generate_copy_from_prompt(
+                user_prompt=context.get("user_prompt", "Generate professional copy"),
+                brand_name=brand_name,
+                context=context
+            )
+            
+            deliverable = {
+                "id": "copy",
+                "type": "markdown",
+                "name": f"{brand_name}_{result['copy_type'].title().replace('_', ' ')}",
+                "content": result["content"],
+                "agent": "CopyBot",
+                "metadata": {
+                    "copy_type": result["copy_type"],
+                    "word_count": result["metadata"]["word_count"],
+                    "industry": result["industry"],
+                    "techniques_used": result["techniques_used"]
+                }
+            }
+        
+        elif task_type == "landing_page":
+            page_copy = await copybot.generate_landing_page(
+                brand_name=brand_name,
+                product_description=context.get("product_description", "innovative solution"),
+                context=context
+            )
+            
+            deliverable = {
+                "id": "landing_page",
+                "type": "markdown",
+                "name": f"{brand_name}_Landing_Page",
+                "content": page_copy["hero"]["long_form_content"],
+                "agent": "CopyBot",
+                "metadata": {
+                    "copy_type": "landing_page",
+                    "sections": ["hero", "features", "testimonials", "cta", "faq"]
+                }
+            }
+        
+        elif task_type == "pitch_deck":
+            deck = await copybot.generate_pitch_deck_copy(
+                brand_name=brand_name,
+                context=context
+            )
+            
+            # Format pitch deck nicely
+            formatted_deck = self._format_pitch_deck(deck, brand_name)
+            
+            deliverable = {
+                "id": "pitch_deck",
+                "type": "markdown",
+                "name": f"{brand_name}_Pitch_Deck",
+                "content": formatted_deck,
+                "agent": "CopyBot",
+                "metadata": {
+                    "copy_type": "pitch_deck",
+                    "slides": len(deck.get("slides", []))
+                }
+            }
+        
+        return deliverable
+    
     def _format_pitch_deck(self, deck: Dict[str, Any], brand_name: str) -> str:
         """Format pitch deck into nice markdown"""
         
@@ -570,7 +881,8 @@ class ManagerAgent:
     async def process_request(
         self,
         user_prompt: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Complete end-to-end processing (for direct execution)"""
         
@@ -578,7 +890,7 @@ class ManagerAgent:
         analysis = self.analyze_request(user_prompt, context)
         
         # Execute
-        result = await self.execute_tasks(analysis)
+        result = await self.execute_tasks(analysis, options=options)
         
         # Compile result
         return {
@@ -647,29 +959,15 @@ class ManagerAgent:
     def _extract_colors(self, text: str) -> List[str]:
         """Extract color mentions from text"""
         
-        common_colors = [
-            "red", "blue", "green", "yellow", "purple", "orange", "pink",
-            "cyan", "magenta", "brown", "black", "white", "gray", "grey",
-            "gold", "silver", "bronze", "teal", "navy", "maroon", "lime",
-            "indigo", "violet", "turquoise", "coral", "salmon"
-        ]
-        
-        text_lower = text.lower()
-        found_colors = []
-        
-        for color in common_colors:
-            if color in text_lower:
-                found_colors.append(color)
-        
-        return found_colors[:3]  # Max 3 colors
+        return CONTEXT_KEYWORDS.scan(text)["color"][:3]  # Max 3 colors
     
     def get_worker_status(self) -> List[Dict[str, Any]]:
         """Get status of all workers"""
         return [agent.get_status() for agent in self.worker_agents.values()]
     
-    def get_conversation_state(self, conversation_id: str) -> Dict[str, Any]:
-        """Get current conversation state"""
-        return self.conversation_manager.get_or_create(conversation_id)
+    def get_conversation_state(self, conversation_id: str) -> Optional[Conversation]:
+        """Get current conversation state, or None if unknown or expired"""
+        return self.conversation_manager.get(conversation_id)
 
 
 # Global instance
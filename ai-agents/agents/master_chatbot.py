@@ -5,6 +5,8 @@ import os
 from typing import Dict, Any, List, Optional
 from loguru import logger
 
+from services.keywords import KeywordMatcher
+
 class MasterChatbot:
     """
     Master AI that chats with users before executing tasks
@@ -20,6 +22,10 @@ class MasterChatbot:
             "pitch_deck": ["pitch deck", "presentation", "slides", "deck"],
             "landing_page": ["landing page", "website copy", "web content", "homepage"],
         }
+        self.keywords = KeywordMatcher({
+            "task": self.task_patterns,
+            "greeting": {"greeting": ["hi", "hello", "hey", "sup", "yo"]}
+        })
         
         logger.info(f"Initialized {self.name}")
     
@@ -36,10 +42,11 @@ class MasterChatbot:
         history = conversation_history or []
         
         # Detect tasks in message
-        detected_tasks = self._detect_tasks(user_message)
+        hits = self.keywords.scan(user_message)
+        detected_tasks = hits["task"]
         
         # Determine conversation state
-        is_greeting = any(word in user_message.lower() for word in ["hi", "hello", "hey", "sup", "yo"])
+        is_greeting = bool(hits["greeting"])
         is_question = "?" in user_message
         has_clear_task = len(detected_tasks) > 0
         
@@ -72,14 +79,7 @@ class MasterChatbot:
     def _detect_tasks(self, message: str) -> List[str]:
         """Detect what tasks are needed"""
         
-        message_lower = message.lower()
-        detected = []
-        
-        for task_type, keywords in self.task_patterns.items():
-            if any(keyword in message_lower for keyword in keywords):
-                detected.append(task_type)
-        
-        return list(set(detected))
+        return self.keywords.scan(message)["task"]
     
     def _generate_greeting(self) -> str:
         """Generate greeting"""
@@ -1,13 +1,19 @@
 """
 Enhanced API - Smart chat handling and task execution
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 from loguru import logger
+from contextlib import asynccontextmanager
+import os
 import uuid
 import sys
+import json
+import time
+import asyncio
 
 # Configure logger
 logger.remove()
@@ -15,8 +21,44 @@ logger.add(sys.stderr, level="INFO")
 
 # Import enhanced manager
 from agents.manager import manager
+from agents.copybot import copybot
+from services.http_pool import http_pool
+from services.jobs import job_queue, JobQueueFull, Job
+from services.cache import logo_cache, copy_cache
+from services.singleflight import text_flight, image_flight
+from services.retry import text_retry, image_retry
+from services.rate_limit import limiters
+from services.executor import image_executor, loop_monitor
+from services.artifacts import artifact_store, parse_range, etag_matches, inline_by_default
+from services.image_codecs import negotiate, UnsupportedFormat
+from services.postprocess import postprocess_metrics
 
-app = FastAPI(title="HyperTask AI API", version="2.0")
+
+async def run_job(job: Job) -> Dict[str, Any]:
+    """Worker entry point for queued /execute jobs"""
+    return await manager.execute_tasks(
+        analysis=job.analysis,
+        conversation_id=job.conversation_id,
+        on_event=job.record_event,
+        options=job.options
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared HTTP pool and job workers for the lifetime of the app"""
+    await http_pool.start()
+    await job_queue.start(run_job, store=manager.conversation_manager.store)
+    await loop_monitor.start()
+    await manager.conversation_manager.start()
+    yield
+    await loop_monitor.stop()
+    await job_queue.stop()
+    await manager.conversation_manager.stop()
+    image_executor.shutdown()
+    await http_pool.close()
+
+app = FastAPI(title="HyperTask AI API", version="2.0", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -34,10 +76,44 @@ class ChatRequest(BaseModel):
 
 class ExecuteRequest(BaseModel):
     conversation_id: str
+    mode: Literal["sync", "job"] = "sync"  # "sync" waits for deliverables, "job" returns a job id
+    bypass_cache: bool = False
+    inline_images: Optional[bool] = None  # embed base64 images (defaults to ARTIFACTS_INLINE_BASE64)
+    image_format: Optional[str] = None  # png, webp-lossless, webp or jpeg; else negotiated from Accept
+    image_effort: Optional[str] = None  # fast, balanced or max
+
+    def options(self, http_request: Request) -> Dict[str, Any]:
+        """Per-request settings passed through to the agents"""
+        return {
+            "bypass_cache": self.bypass_cache,
+            "inline_images": inline_by_default() if self.inline_images is None else self.inline_images,
+            "artifact_base_url": _artifact_base_url(http_request),
+            "image_output": _image_output(self.image_format, self.image_effort, http_request)
+        }
+
+class CopyStreamRequest(BaseModel):
+    prompt: str
+    brand_name: Optional[str] = None
+    context: Optional[Dict[str, Any]] = None
+    conversation_id: Optional[str] = None  # keeps CopyBot history per conversation
 
 class DirectTaskRequest(BaseModel):
     prompt: str
     context: Optional[Dict[str, Any]] = None
+    inline_images: Optional[bool] = None
+    image_format: Optional[str] = None
+    image_effort: Optional[str] = None
+
+def _artifact_base_url(http_request: Request) -> str:
+    """Public origin for artifact links; set ARTIFACTS_BASE_URL behind a proxy"""
+    return os.getenv("ARTIFACTS_BASE_URL") or str(http_request.base_url)
+
+def _image_output(image_format: Optional[str], effort: Optional[str], http_request: Request) -> Dict[str, Any]:
+    """Image encoding for a request: explicit fields first, then the Accept header"""
+    try:
+        return negotiate(image_format, effort, http_request.headers.get("accept"))
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # Endpoints
@@ -57,7 +133,27 @@ async def health():
     worker_status = manager.get_worker_status()
     return {
         "status": "healthy",
-        "workers": worker_status
+        "workers": worker_status,
+        "http_pool": http_pool.get_stats(),
+        "jobs": job_queue.get_stats(),
+        "caches": {
+            "logo": logo_cache.get_stats(),
+            "copy": copy_cache.get_stats()
+        },
+        "singleflight": {
+            "text": text_flight.get_stats(),
+            "image": image_flight.get_stats()
+        },
+        "retries": {
+            "text": text_retry.get_stats(),
+            "image": image_retry.get_stats()
+        },
+        "admission": limiters.get_stats(),
+        "image_executor": image_executor.get_stats(),
+        "event_loop_lag": loop_monitor.get_stats(),
+        "artifacts": artifact_store.get_stats(),
+        "postprocess": postprocess_metrics.get_stats(),
+        "conversations": manager.conversation_manager.get_stats()
     }
 
 @app.post("/chat")
@@ -94,8 +190,46 @@ async def chat(request: ChatRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _ready_analysis(conversation_id: str) -> Dict[str, Any]:
+    """Return the task analysis for a conversation that is ready to execute"""
+    
+    conv_state = manager.get_conversation_state(conversation_id)
+    
+    if conv_state is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Conversation not found or expired. Please start a new conversation."
+        )
+    
+    if not conv_state.ready_to_execute:
+        raise HTTPException(
+            status_code=400,
+            detail="Conversation not ready for execution. Continue chatting to provide more details."
+        )
+    
+    analysis = conv_state.analysis
+    if not analysis:
+        raise HTTPException(
+            status_code=400,
+            detail="No task analysis found. Please start a new conversation."
+        )
+    
+    return analysis
+
+def _format_execution(result: Dict[str, Any], conversation_id: str) -> Dict[str, Any]:
+    """Shape an execute_tasks result for API responses"""
+    return {
+        "status": result["status"],
+        "deliverables": result["deliverables"],
+        "transaction": {
+            "total": result["total_cost"],
+            "burn_fee": result["burn_fee"]
+        },
+        "conversation_id": conversation_id
+    }
+
 @app.post("/execute")
-async def execute(request: ExecuteRequest):
+async def execute(request: ExecuteRequest, http_request: Request):
     """
     Execute tasks for a ready conversation
     
@@ -103,44 +237,42 @@ async def execute(request: ExecuteRequest):
     1. Retrieves the conversation state
     2. Executes all planned tasks
     3. Returns formatted deliverables
+    
+    With mode="job" it queues the work and returns a job id immediately;
+    poll /jobs/{job_id} for progress and /jobs/{job_id}/result when done.
     """
     
     try:
         logger.info(f"Executing tasks for conversation: {request.conversation_id}")
         
-        # Get conversation state
-        conv_state = manager.get_conversation_state(request.conversation_id)
+        analysis = _ready_analysis(request.conversation_id)
+        options = request.options(http_request)
         
-        if not conv_state.get("ready_to_execute"):
-            raise HTTPException(
-                status_code=400,
-                detail="Conversation not ready for execution. Continue chatting to provide more details."
-            )
-        
-        analysis = conv_state.get("analysis")
-        if not analysis:
-            raise HTTPException(
-                status_code=400,
-                detail="No task analysis found. Please start a new conversation."
-            )
+        if request.mode == "job":
+            try:
+                job = job_queue.submit(request.conversation_id, analysis, options)
+            except JobQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            
+            logger.info(f"Queued job {job.id} for conversation {request.conversation_id}")
+            return JSONResponse(status_code=202, content={
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"/jobs/{job.id}",
+                "result_url": f"/jobs/{job.id}/result",
+                "conversation_id": request.conversation_id
+            })
         
         # Execute tasks
         result = await manager.execute_tasks(
             analysis=analysis,
-            conversation_id=request.conversation_id
+            conversation_id=request.conversation_id,
+            options=options
         )
         
         logger.success(f"Execution completed: {len(result['deliverables'])} deliverables")
         
-        return {
-            "status": result["status"],
-            "deliverables": result["deliverables"],
-            "transaction": {
-                "total": result["total_cost"],
-                "burn_fee": result["burn_fee"]
-            },
-            "conversation_id": request.conversation_id
-        }
+        return _format_execution(result, request.conversation_id)
         
     except HTTPException:
         raise
@@ -150,8 +282,144 @@ async def execute(request: ExecuteRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Stop nginx-style proxies from buffering the stream
+}
+
+@app.post("/execute/stream")
+async def execute_stream(request: ExecuteRequest, http_request: Request):
+    """
+    Execute tasks for a ready conversation, streaming progress as SSE
+    
+    Emits task_started, task_progress (heartbeat while a task runs),
+    task_completed (carrying the deliverable) and task_failed events as
+    they happen, then a final "done" event with the transaction summary.
+    """
+    
+    analysis = _ready_analysis(request.conversation_id)
+    options = request.options(http_request)
+    heartbeat = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "5"))
+    
+    async def event_stream():
+        events: asyncio.Queue = asyncio.Queue()
+        running: Dict[int, Dict[str, Any]] = {}
+        
+        execution = asyncio.create_task(manager.execute_tasks(
+            analysis=analysis,
+            conversation_id=request.conversation_id,
+            on_event=events.put_nowait,
+            options=options
+        ))
+        execution.add_done_callback(lambda _: events.put_nowait(None))
+        
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    now = time.time()
+                    for index, task in running.items():
+                        yield _sse("task_progress", {
+                            **task,
+                            "index": index,
+                            "elapsed": round(now - task["started_at"], 1)
+                        })
+                    continue
+                
+                if event is None:
+                    break
+                
+                kind = event.pop("event")
+                if kind == "task_started":
+                    running[event["index"]] = {
+                        "task_type": event["task_type"],
+                        "agent": event["agent"],
+                        "started_at": time.time()
+                    }
+                else:
+                    running.pop(event["index"], None)
+                yield _sse(kind, event)
+            
+            result = execution.result()
+            summary = _format_execution(result, request.conversation_id)
+            summary.pop("deliverables")
+            summary["deliverable_count"] = len(result["deliverables"])
+            yield _sse("done", summary)
+            
+        except Exception as e:
+            logger.error(f"Execution stream error: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            # Client went away (or we failed): stop the remaining work
+            if not execution.done():
+                execution.cancel()
+    
+    logger.info(f"Streaming execution for conversation: {request.conversation_id}")
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/copy/stream")
+async def copy_stream(request: CopyStreamRequest):
+    """
+    Stream CopyBot output token by token as SSE
+    
+    Emits "token" events as text arrives. A "fallback" event carries the
+    template response and replaces any tokens already shown. A final
+    "result" event carries the same payload as a non-streaming copy task.
+    """
+    
+    logger.info(f"Streaming copy: {request.prompt[:100]}")
+    
+    async def event_stream():
+        try:
+            context = dict(request.context or {})
+            if request.conversation_id:
+                context["conversation_id"] = request.conversation_id
+            async for event in copybot.stream_copy_from_prompt(
+                user_prompt=request.prompt,
+                brand_name=request.brand_name,
+                context=context
+            ):
+                kind = event.pop("type")
+                yield _sse(kind, event)
+        except Exception as e:
+            logger.error(f"Copy stream error: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Get job status, per-task progress and deliverables finished so far"""
+    
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    """Get the final result of a finished job"""
+    
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status}")
+    
+    if job.result is None:
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    
+    return _format_execution(job.result, job.conversation_id)
+
 @app.post("/task/direct")
-async def direct_task(request: DirectTaskRequest):
+async def direct_task(request: DirectTaskRequest, http_request: Request):
     """
     Direct task execution (bypass chat)
     
@@ -163,23 +431,99 @@ async def direct_task(request: DirectTaskRequest):
         
         result = await manager.process_request(
             user_prompt=request.prompt,
-            context=request.context
+            context=request.context,
+            options={
+                "inline_images": inline_by_default() if request.inline_images is None else request.inline_images,
+                "artifact_base_url": _artifact_base_url(http_request),
+                "image_output": _image_output(request.image_format, request.image_effort, http_request)
+            }
         )
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Direct task error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+ARTIFACT_CHUNK_SIZE = 64 * 1024
+
+def _read_file(path: str, start: int, length: int):
+    """Yield a byte range of a file in chunks"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(ARTIFACT_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+@app.api_route("/artifacts/{artifact_id}", methods=["GET", "HEAD"])
+async def get_artifact(artifact_id: str, http_request: Request):
+    """
+    Serve a stored deliverable
+    
+    Ids are content hashes, so responses are immutable: clients get a
+    strong ETag (If-None-Match -> 304) and single byte ranges (206).
+    HEAD returns the same headers without the body.
+    """
+    
+    found = await artifact_store.open(artifact_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    path, size, media_type = found
+    
+    etag = artifact_store.etag(artifact_id)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    
+    if_none_match = http_request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        artifact_store.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    
+    start, end = 0, size - 1
+    status_code = 200
+    range_header = http_request.headers.get("range")
+    if_range = http_request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_range(range_header, size)
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        artifact_store.partial += 1
+    
+    headers["Content-Length"] = str(end - start + 1)
+    if http_request.method == "HEAD":
+        return Response(status_code=status_code, media_type=media_type, headers=headers)
+    
+    artifact_store.served += 1
+    return StreamingResponse(
+        _read_file(path, start, end - start + 1),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
+
 @app.get("/conversation/{conversation_id}")
 async def get_conversation(conversation_id: str):
     """Get conversation state and history"""
     
     try:
         state = manager.get_conversation_state(conversation_id)
-        return state
+        if state is None:
+            raise HTTPException(status_code=404, detail="Conversation not found or expired")
+        return state.to_dict()
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching conversation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -190,8 +534,8 @@ async def reset_conversation(conversation_id: str):
     
     try:
         # Clear conversation state
-        if conversation_id in manager.conversation_manager.conversations:
-            del manager.conversation_manager.conversations[conversation_id]
+        manager.conversation_manager.delete(conversation_id)
+        await manager.conversation_manager.flush()
         
         return {"status": "reset", "conversation_id": conversation_id}
         
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Conversation Memory Benchmark
+Bytes per live conversation: dict-of-dicts state against slotted records
+
+    python benchmarks/conversation_memory.py --conversations 20000 --messages 6
+
+Builds the same conversations both ways and measures them with
+tracemalloc. "total" includes the message text; "overhead" excludes it by
+allocating all message strings before measuring, which is the part the
+record layout controls. Also reports the manager's own size estimate.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+logger.remove()
+
+from agents.manager import ConversationManager
+from services.conversation_store import Conversation, Message
+
+
+def texts(conversations: int, messages: int):
+    # Unique strings of a typical chat-message length
+    return [
+        [f"conversation {c} message {m}: make the logo bolder, a bit more blue please" for m in range(messages)]
+        for c in range(conversations)
+    ]
+
+
+def build_dicts(contents):
+    state = {}
+    for c, messages in enumerate(contents):
+        conv_id = f"conv-{c:08d}"
+        state[conv_id] = {
+            "id": conv_id,
+            "messages": [
+                # Roles decoded from JSON or request bodies are fresh strings
+                {"role": "".join(["us", "er"]), "content": text, "timestamp": time.time()}
+                for text in messages
+            ],
+            "brand_name": None,
+            "industry": None,
+            "extracted_info": {},
+            "ready_to_execute": False,
+            "analysis": None
+        }
+    return state
+
+
+def build_records(contents):
+    state = {}
+    for c, messages in enumerate(contents):
+        conv = Conversation.new(f"conv-{c:08d}")
+        conv.messages.extend(Message("".join(["us", "er"]), text, time.time()) for text in messages)
+        state[conv.id] = conv
+    return state
+
+
+def measure(build, conversations: int, messages: int, include_text: bool) -> float:
+    contents = None if include_text else texts(conversations, messages)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = build(contents if contents is not None else texts(conversations, messages))
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del state
+    return used / conversations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per conversation")
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--messages", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{args.conversations:,} conversations x {args.messages} messages\n")
+    print(f"{'layout':<9} {'total':>12} {'overhead':>12}")
+    results = {}
+    for name, build in (("dicts", build_dicts), ("records", build_records)):
+        total = measure(build, args.conversations, args.messages, include_text=True)
+        overhead = measure(build, args.conversations, args.messages, include_text=False)
+        results[name] = (total, overhead)
+        print(f"{name:<9} {total:10,.0f} B {overhead:10,.0f} B")
+
+    saved = 1 - results["records"][1] / results["dicts"][1]
+    print(f"\nrecords save {saved:.0%} of per-conversation overhead")
+
+    manager = ConversationManager(max_conversations=args.conversations, max_bytes=2**62)
+    for c, messages in enumerate(texts(args.conversations, args.messages)):
+        for text in messages:
+            manager.add_message(f"conv-{c:08d}", "user", text)
+    print(f"manager estimate: {manager.bytes / args.conversations:,.0f} B per conversation "
+          f"(measured total: {results['records'][0]:,.0f} B)")
+
+
+if __name__ == "__main__":
+    main()
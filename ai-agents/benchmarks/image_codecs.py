@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Image Codec Benchmark
+Encode time against byte size for every output format and effort level
+
+    python benchmarks/image_codecs.py --runs 5
+
+Runs on two 1024x1024 inputs: a flat-color placeholder logo and a
+smooth, textured image standing in for model output. "variants" is the
+full 1024/512/128 set produced by encode_variants.
+"""
+
+import os
+import sys
+import time
+import argparse
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageFilter
+from loguru import logger
+
+logger.remove()
+
+from services.rendering import render_placeholder
+from services.image_codecs import FORMATS, EFFORTS, default_output, encode, encode_variants
+
+
+def sample_images():
+    placeholder = Image.open(
+        __import__("io").BytesIO(
+            render_placeholder("Acme", ["purple", "cyan"], "modern", {**default_output(), "sizes": [1024]})[0][1024]
+        )
+    ).convert("RGB")
+
+    # Soft gradients plus blurred noise: closer to diffusion output than flat fills
+    gradient = Image.linear_gradient("L").resize((1024, 1024))
+    noise = Image.effect_noise((1024, 1024), 64).filter(ImageFilter.GaussianBlur(3))
+    generated = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90)))
+
+    return {"placeholder": placeholder, "generated": generated}
+
+
+def timed(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode time vs size per codec")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--quality", type=int, default=90, help="lossy quality for webp/jpeg")
+    args = parser.parse_args()
+
+    for name, img in sample_images().items():
+        print(f"\n{name} (1024x1024)")
+        print(f"  {'format':<14} {'effort':<9} {'encode':>9} {'bytes':>9} {'variants':>10} {'all bytes':>10}")
+        for fmt in FORMATS:
+            for effort in EFFORTS[fmt]:
+                output = {"format": fmt, "effort": effort, "quality": args.quality, "sizes": [1024, 512, 128]}
+                encode_ms, data = timed(lambda: encode(img, output), args.runs)
+                variants_ms, variants = timed(lambda: encode_variants(img, output), args.runs)
+                print(
+                    f"  {fmt:<14} {effort:<9} {encode_ms:7.1f}ms {len(data):9,} "
+                    f"{variants_ms:8.1f}ms {sum(len(v) for v in variants.values()):10,}"
+                )
+
+
+if __name__ == "__main__":
+    main()
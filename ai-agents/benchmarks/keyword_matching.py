@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Keyword Matching Benchmark
+Single-pass keyword matchers against the substring scans they replace
+
+    python benchmarks/keyword_matching.py --runs 200
+
+Times the keyword work done for one chat message: the manager's context
+analysis (task, style, colors, industry), CopyBot's prompt intent and its
+industry detection. "substring" is the previous any(word in text ...)
+chains, one scan of the message per keyword; "matcher" is one
+KeywordMatcher.scan per matcher, which splits the message into words
+once. Messages are built from real prompt fragments and grow to about
+ten thousand words.
+
+The sample prompts at the end show where the matcher's results differ
+from substring results, in both directions. A lost hit is expected when
+its keyword only occurs inside a word ("app" in "happy") or is a stem
+shorter than PREFIX_MIN letters ("app" in "apple"); anything else is
+marked REGRESSION. The stem samples ("online banking", "designing") are
+there to catch those, along with CopyBot's industry detection for an
+explicitly stated industry such as 'healthcare'.
+"""
+
+import os
+import sys
+import time
+import argparse
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+logger.remove()
+
+from agents.manager import CONTEXT_KEYWORDS, COLORS
+from agents.copybot import copybot, INTENT_KEYWORDS, INDUSTRY_KEYWORDS, INDUSTRY_MATCHER
+from services.keywords import PREFIX_MIN
+
+FRAGMENTS = [
+    "I need a logo for my startup called Nimbus",
+    "we are building a platform that helps small teams ship faster",
+    "make it modern and sleek, maybe navy and teal with a bit of gold",
+    "this is happy news for everyone who maintains their email lists",
+    "the landing page should explain the product description clearly",
+    "our customers worry about hidden fees and slow processes",
+]
+
+SAMPLES = [
+    "hi, this is for a happy little bakery",
+    "Write a tagline for our email marketing campaign",
+    "logos for a machine learning course",
+    "a catchy slogan for my apple orchard, something with a story",
+    # Stems that substring scans matched and whole words alone would not
+    "a logo for our online banking service",
+    "slogan for a technology startup",
+    "branding and a tagline for my studio",
+    "designing icons for a healthcare clinic",
+]
+
+# Industries a user can state outright, e.g. the context's 'industry' field
+STATED_INDUSTRIES = ["healthcare", "banking", "technology", "e-commerce", "edtech"]
+
+
+def substring_scan(text: str) -> dict:
+    """The previous keyword checks, one substring scan per keyword"""
+    text = text.lower()
+    found = {}
+    for group, categories in CONTEXT_KEYWORDS.groups.items():
+        found[group] = [c for c, words in categories.items() if any(w in text for w in words)]
+    for group, categories in INTENT_KEYWORDS.groups.items():
+        found[f"intent_{group}"] = [c for c, words in categories.items() if any(w in text for w in words)]
+    found["industries"] = [i for i, words in INDUSTRY_KEYWORDS.items() if any(w in text for w in words)]
+    return found
+
+
+def substring_industry(context: dict) -> str:
+    """CopyBot's previous industry detection: first industry with any substring hit"""
+    text = " ".join(str(context.get(k, "")) for k in ("industry", "user_prompt", "product_description")).lower()
+    for industry, words in INDUSTRY_KEYWORDS.items():
+        if any(w in text for w in words):
+            return industry
+    return "saas"
+
+
+def keywords_for(group: str, category: str) -> list:
+    if group == "industries":
+        return INDUSTRY_KEYWORDS[category]
+    if group.startswith("intent_"):
+        return INTENT_KEYWORDS.groups[group[len("intent_"):]][category]
+    return CONTEXT_KEYWORDS.groups[group][category]
+
+
+def why_lost(text: str, keywords: list) -> str:
+    """Why a substring hit is gone; mid-word and short-stem hits are expected"""
+    text = text.lower()
+    words = text.split()
+    hits = [k for k in keywords if k in text]
+    stems = [k for k in hits if any(w.startswith(k) for w in words)]
+    if not stems:
+        return f"dropped, inside a word: {hits}"
+    if all(len(k) < PREFIX_MIN for k in stems):
+        return f"dropped, short stem: {stems}"
+    return f"REGRESSION: {stems}"
+
+
+def matcher_scan(text: str) -> dict:
+    found = dict(CONTEXT_KEYWORDS.scan(text))
+    found.update({f"intent_{g}": c for g, c in INTENT_KEYWORDS.scan(text).items()})
+    found["industries"] = INDUSTRY_MATCHER.scan(text)["industry"]
+    return found
+
+
+def timed(fn, text: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(text)
+        samples.append(time.perf_counter() - started)
+    return median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled keyword matching vs substring scans")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    keywords = sum(len(w) for g in (CONTEXT_KEYWORDS.groups, INTENT_KEYWORDS.groups) for c in g.values() for w in c.values())
+    keywords += sum(len(w) for w in INDUSTRY_KEYWORDS.values())
+    print(f"{keywords} keyword checks per message ({len(COLORS)} colors)\n")
+
+    print(f"{'message':>10} {'substring':>11} {'matcher':>11} {'speedup':>8}")
+    for repeat in (1, 10, 100, 1000):
+        text = ". ".join(FRAGMENTS[i % len(FRAGMENTS)] for i in range(repeat))
+        substring_us = timed(substring_scan, text, args.runs)
+        matcher_us = timed(matcher_scan, text, args.runs)
+        print(f"{len(text):8,} ch {substring_us:9.1f}us {matcher_us:9.1f}us {substring_us / matcher_us:7.1f}x")
+
+    print("\nwhere results differ:")
+    regressions = 0
+    for sample in SAMPLES:
+        before, after = substring_scan(sample), matcher_scan(sample)
+        changes = []
+        for group in before:
+            if before[group] == after[group]:
+                continue
+            changes.append(f"{group}: {before[group]} -> {after[group]}")
+            for category in before[group]:
+                if category not in after[group]:
+                    reason = why_lost(sample, keywords_for(group, category))
+                    regressions += reason.startswith("REGRESSION")
+                    changes.append(f"  lost {category}, {reason}")
+        print(f"  {sample!r}")
+        for change in changes or ["(same)"]:
+            print(f"      {change}")
+
+    print("\nstated industry -> detected:")
+    for stated in STATED_INDUSTRIES:
+        context = {"industry": stated}
+        before, after = substring_industry(context), copybot._detect_industry("Acme", context)
+        mark = "" if before == after else "  REGRESSION" if before != "saas" else "  (new)"
+        regressions += mark == "  REGRESSION"
+        print(f"  {stated!r:14} {before:>11} -> {after}{mark}")
+
+    print(f"\n{regressions} regression(s)")
+
+
+if __name__ == "__main__":
+    main()
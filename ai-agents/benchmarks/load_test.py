@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+HyperTask Load Test
+Drives /chat -> /execute against a running API and reports latency percentiles
+
+Meant to run offline against mock_inference.py:
+
+    python mock_inference.py --port 8900 &
+    HF_API_BASE_URL=http://localhost:8900/models/ HF_TOKEN=mock uvicorn api.main:app --port 8000 &
+    python benchmarks/load_test.py --conversations 50 --concurrency 10
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+from typing import Dict, Any, List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_conversation(client: httpx.AsyncClient, args, index: int) -> Dict[str, Any]:
+    """One full user journey: a ready-to-execute chat message, then execution"""
+    brand = "Loadtest" if args.same_brand else f"Brand{index}{uuid.uuid4().hex[:6]}"
+    message = f"I need a logo and a tagline for my fintech startup called {brand}"
+    result: Dict[str, Any] = {"ok": False}
+
+    try:
+        started = time.perf_counter()
+        chat = await client.post("/chat", json={"message": message})
+        chat.raise_for_status()
+        result["chat_s"] = time.perf_counter() - started
+
+        body = chat.json()
+        if not body.get("ready_to_execute"):
+            result["error"] = "conversation not ready"
+            return result
+
+        started = time.perf_counter()
+        execute = await client.post("/execute", json={
+            "conversation_id": body["conversation_id"],
+            "bypass_cache": args.bypass_cache
+        })
+        execute.raise_for_status()
+        result["execute_s"] = time.perf_counter() - started
+        result["deliverables"] = len(execute.json().get("deliverables", []))
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def summarize(name: str, values: List[float]):
+    if not values:
+        print(f"  {name:<10} no samples")
+        return
+    print(
+        f"  {name:<10} p50 {percentile(values, 50):7.2f}s  p95 {percentile(values, 95):7.2f}s  "
+        f"p99 {percentile(values, 99):7.2f}s  max {max(values):7.2f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test /chat -> /execute")
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--bypass-cache", action="store_true", help="force fresh generations")
+    parser.add_argument("--same-brand", action="store_true", help="identical requests, to exercise coalescing")
+    args = parser.parse_args()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    async with httpx.AsyncClient(base_url=args.api, timeout=args.timeout) as client:
+
+        async def bounded(i: int):
+            async with semaphore:
+                return await run_conversation(client, args, i)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*[bounded(i) for i in range(args.conversations)])
+        elapsed = time.perf_counter() - started
+
+        try:
+            health = (await client.get("/health")).json()
+        except Exception:
+            health = {}
+
+    ok = [r for r in results if r["ok"]]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+    print(f"\n{len(results)} conversations, concurrency {args.concurrency}, {elapsed:.1f}s wall")
+    print(f"  succeeded  {len(ok)}  ({len(ok) / elapsed:.2f} conversations/s)")
+    summarize("chat", [r["chat_s"] for r in results if "chat_s" in r])
+    summarize("execute", [r["execute_s"] for r in ok])
+    for error, count in errors.items():
+        print(f"  error x{count}: {error}")
+
+    if health:
+        print("\nRetry outcomes:")
+        for kind, stats in health.get("retries", {}).items():
+            print(f"  {kind:<6} {stats.get('outcomes')}")
+        print("Admission:")
+        for model, stats in health.get("admission", {}).items():
+            print(
+                f"  {model}: admitted {stats['admitted']}, avg wait {stats['avg_wait_ms']}ms, "
+                f"max wait {stats['max_wait_ms']}ms, timeouts {stats['queue_timeouts']}"
+            )
+
+    return 0 if len(ok) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
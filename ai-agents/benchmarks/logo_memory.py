@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Logo Memory Benchmark
+Peak memory and time to turn one generated image into stored logo bytes
+
+    python benchmarks/logo_memory.py --runs 5
+
+Each scenario runs in a fresh subprocess after one warm-up logo. "py peak"
+is the tracemalloc peak (bytes/str buffers: copies, base64, data URIs);
+"rss peak" is the rise in peak RSS, which also covers Pillow's pixel
+buffers that tracemalloc cannot see. The input is a 1024x1024 JPEG, the
+format the hosted FLUX models return.
+
+    legacy        decode, enhance, PNG (optimize) re-encode, base64 data URI
+    enhanced      decode, sharpen+contrast, encode 1024/512/128
+    passthrough   no pixel stages, JPEG out: source bytes kept, small sizes
+                  decoded at reduced scale
+    passthrough1  as above with only the full size requested: no decode
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import tracemalloc
+import subprocess
+from io import BytesIO
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageEnhance, ImageFilter
+from loguru import logger
+
+logger.remove()
+
+from agents.designbot import designbot
+from services.image_codecs import default_output
+from services.postprocess import PostProcessChain, DEFAULT_CHAIN
+from services.rendering import process_generated
+
+SCENARIOS = ["legacy", "enhanced", "passthrough", "passthrough1"]
+
+
+def sample_jpeg() -> bytes:
+    gradient = Image.linear_gradient("L").resize((1024, 1024))
+    noise = Image.effect_noise((1024, 1024), 64).filter(ImageFilter.GaussianBlur(3))
+    img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90)))
+    buffered = BytesIO()
+    img.save(buffered, format="JPEG", quality=95)
+    return buffered.getvalue()
+
+
+def legacy(image_bytes: bytes) -> str:
+    """The pipeline before artifacts and codec negotiation"""
+    img = Image.open(BytesIO(image_bytes))
+    if img.size[0] > 1024 or img.size[1] > 1024:
+        img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    img = ImageEnhance.Sharpness(img).enhance(1.2)
+    img = ImageEnhance.Contrast(img).enhance(1.1)
+    buffered = BytesIO()
+    img.save(buffered, format="PNG", optimize=True)
+    return f"data:image/png;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+
+
+def pipeline(scenario: str, image_bytes: bytes):
+    if scenario == "legacy":
+        return legacy(image_bytes)
+
+    output = default_output()
+    if scenario == "enhanced":
+        return process_generated(image_bytes, output, PostProcessChain.parse(DEFAULT_CHAIN))
+
+    chain = PostProcessChain.parse("resize:1024")
+    output["format"] = "jpeg"
+    if scenario == "passthrough1":
+        output["sizes"] = [1024]
+    size = designbot._passthrough_size(image_bytes, output, chain)
+    assert size is not None, "expected a pass-through"
+    variants = {}
+    if any(edge < max(size) for edge in output["sizes"]):
+        variants, _, _ = process_generated(image_bytes, output, chain, True)
+    variants[max(size)] = image_bytes
+    return variants
+
+
+def rss_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def measure(scenario: str, runs: int) -> dict:
+    image_bytes = sample_jpeg()
+    pipeline(scenario, image_bytes)  # warm-up: codecs, fonts, lazy imports
+
+    have_rss = reset_peak_rss()
+    baseline = rss_kb("VmRSS:")
+    tracemalloc.start()
+    pipeline(scenario, image_bytes)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = (rss_kb("VmHWM:") - baseline) * 1024 if have_rss else None
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        pipeline(scenario, image_bytes)
+        samples.append(time.perf_counter() - started)
+
+    return {
+        "py_peak": py_peak,
+        "rss_peak": rss_peak,
+        "ms": median(samples) * 1000,
+        "input": len(image_bytes)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory per logo")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(measure(args.scenario, args.runs)))
+        return
+
+    print(f"{'scenario':<13} {'py peak':>10} {'rss peak':>10} {'time':>9}")
+    for scenario in SCENARIOS:
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--scenario", scenario, "--runs", str(args.runs)],
+            capture_output=True, text=True, check=True
+        )
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        rss = f"{result['rss_peak'] / 2**20:8.1f}MB" if result["rss_peak"] is not None else f"{'n/a':>10}"
+        print(f"{scenario:<13} {result['py_peak'] / 2**20:8.2f}MB {rss} {result['ms']:7.1f}ms")
+    print(f"\ninput: {result['input']:,} byte JPEG, 1024x1024")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Placeholder Renderer Benchmark
+Time to produce DesignBot's outage-time placeholder logos
+
+    python benchmarks/placeholder_render.py --runs 20
+
+Reports per-style render time for the gradient background alone and for
+the full placeholder (background, accents, initial and PNG encode) with
+cold layer caches. "cached" is a repeat placeholder served from
+DesignBot's layer caches. The full figures are dominated by PNG encoding.
+"""
+
+import os
+import sys
+import time
+import argparse
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+logger.remove()
+
+from services import rendering
+from services.image_codecs import default_output
+
+STYLES = ["minimal", "tech", "modern"]
+
+
+def render(kind: str, cached: bool) -> bytes:
+    if not cached:
+        for cache in (rendering.backgrounds, rendering.glyphs, rendering.encoded_placeholders):
+            cache.clear()
+    output = {**default_output(), "format": "png", "sizes": [1024]}
+    return rendering.render_placeholder("Acme", ["purple", "cyan"], kind, output)[0][1024]
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Placeholder rendering cost")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    primary = rendering.parse_color("purple")
+    secondary = rendering.parse_color("cyan")
+
+    print(f"{'style':<9} {'background':>11} {'full':>9} {'cached':>9}")
+    for kind in STYLES:
+        background = timed(lambda: rendering.render_background(kind, primary, secondary), args.runs)
+        full = timed(lambda: render(kind, cached=False), args.runs)
+        render(kind, cached=True)
+        cached = timed(lambda: render(kind, cached=True), args.runs)
+        print(f"{kind:<9} {background:9.2f}ms {full:7.2f}ms {cached:7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
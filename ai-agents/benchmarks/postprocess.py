@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Post-Processing Benchmark
+Post-processing chains against the ImageEnhance passes they replace
+
+    python benchmarks/postprocess.py --runs 10
+
+For each chain, times the two-pass ImageEnhance reference (Sharpness,
+then Contrast) and PostProcessChain.apply on a 1024x1024 image, and
+reports how far the outputs differ: the largest per-channel difference
+and the share of pixels differing by more than one level. "full range"
+is an image whose contrast is already at spec, so that stage is skipped.
+"""
+
+import os
+import sys
+import time
+import argparse
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageChops, ImageEnhance, ImageFilter
+
+from services.postprocess import PostProcessChain
+
+CHAINS = ["sharpen:1.2,contrast:1.1", "contrast:1.1", "sharpen:1.2"]
+
+
+def sample_images():
+    gradient = Image.linear_gradient("L").resize((1024, 1024))
+    noise = Image.effect_noise((1024, 1024), 64).filter(ImageFilter.GaussianBlur(3))
+    soft = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90)))
+    full = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.ROTATE_90), gradient))
+    return {"generated": soft, "full range": full}
+
+
+def reference(img: Image.Image, chain: PostProcessChain) -> Image.Image:
+    if "sharpen" in chain.steps:
+        img = ImageEnhance.Sharpness(img).enhance(chain.steps["sharpen"])
+    if "contrast" in chain.steps:
+        img = ImageEnhance.Contrast(img).enhance(chain.steps["contrast"])
+    return img
+
+
+def difference(expected: Image.Image, actual: Image.Image):
+    """Largest per-channel difference, and % of pixels off by more than one level"""
+    diff = ImageChops.difference(expected.convert("RGB"), actual.convert("RGB"))
+    largest = max(high for _, high in diff.getextrema())
+    over = [band.point(lambda v: 255 if v > 1 else 0) for band in diff.split()]
+    mask = ImageChops.lighter(ImageChops.lighter(over[0], over[1]), over[2])
+    return largest, mask.histogram()[255] / (mask.width * mask.height) * 100
+
+
+def timed(fn, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PostProcessChain vs ImageEnhance post-processing")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'image':<11} {'chain':<26} {'enhance':>9} {'apply':>9} {'speedup':>8} {'max diff':>9} {'>1 level':>9}  skipped")
+    for name, img in sample_images().items():
+        for spec in CHAINS:
+            chain = PostProcessChain.parse(spec)
+            reference_ms, expected = timed(lambda: reference(img, chain), args.runs)
+            apply_ms, (actual, report) = timed(lambda: chain.apply(img), args.runs)
+
+            largest, share = difference(expected, actual)
+            print(
+                f"{name:<11} {spec:<26} {reference_ms:7.1f}ms {apply_ms:7.1f}ms {reference_ms / apply_ms:7.1f}x "
+                f"{largest:9d} {share:8.2f}%  {','.join(report['skipped']) or '-'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+HyperTask Mock Inference Server
+Local stand-in for the Hugging Face Inference API, for load and latency testing
+
+Speaks the same request/response formats the agents use: text generation
+(plain JSON and TGI-style token streaming) and image generation (raw image
+bytes). Point the agents at it with:
+
+    python mock_inference.py --port 8900
+    HF_API_BASE_URL=http://localhost:8900/models/ HF_TOKEN=mock python api/main.py
+
+Behaviour is set with MOCK_* environment variables or the matching flags:
+
+    MOCK_TEXT_LATENCY      time to first token         (default lognormal:0.8:0.4)
+    MOCK_TOKEN_LATENCY     delay between tokens        (default fixed:0.02)
+    MOCK_IMAGE_LATENCY     image generation time       (default lognormal:4:0.3)
+    MOCK_LOADING_SECONDS   503 "model loading" window after a model's first request
+    MOCK_RATE_LIMIT_RATE   fraction of requests answered 429 with Retry-After
+    MOCK_ERROR_RATE        fraction of requests answered 500
+    MOCK_TIMEOUT_RATE      fraction of requests that hang for MOCK_TIMEOUT_SECONDS
+    MOCK_TEXT_TOKENS       tokens per text response, capped by max_new_tokens
+    MOCK_IMAGE_SIZE        edge length of generated images in pixels
+    MOCK_IMAGE_FORMAT      png or jpeg
+    MOCK_IMAGE_MODELS      regex matching model ids that are served as image models
+    MOCK_SEED              seed for reproducible runs
+
+Latency specs are "fixed:S", "uniform:LO:HI", "normal:MEAN:STD",
+"lognormal:MEDIAN:SIGMA" or "exponential:MEAN", all in seconds.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from io import BytesIO
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from PIL import Image
+
+DEFAULTS = {
+    "MOCK_TEXT_LATENCY": "lognormal:0.8:0.4",
+    "MOCK_TOKEN_LATENCY": "fixed:0.02",
+    "MOCK_IMAGE_LATENCY": "lognormal:4:0.3",
+    "MOCK_LOADING_SECONDS": "0",
+    "MOCK_LOADING_ESTIMATE": "5",
+    "MOCK_RATE_LIMIT_RATE": "0",
+    "MOCK_RETRY_AFTER_SECONDS": "2",
+    "MOCK_ERROR_RATE": "0",
+    "MOCK_TIMEOUT_RATE": "0",
+    "MOCK_TIMEOUT_SECONDS": "600",
+    "MOCK_TEXT_TOKENS": "200",
+    "MOCK_IMAGE_SIZE": "1024",
+    "MOCK_IMAGE_FORMAT": "png",
+    "MOCK_IMAGE_MODELS": "flux|diffusion|sdxl",
+    "MOCK_SEED": ""
+}
+
+WORDS = (
+    "bold brand story growth modern trusted simple smart future team "
+    "customers launch scale product value design clear fast secure "
+    "platform vision impact people built craft everyday better"
+).split()
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Turn a latency spec such as "uniform:0.2:1.5" into a sampler"""
+    kind, *args = spec.split(":")
+    values = [float(a) for a in args]
+
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda: values[0] * math.exp(rng.gauss(0, values[1]))
+    if kind == "exponential":
+        return lambda: rng.expovariate(1 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class MockConfig:
+    """Mock behaviour from MOCK_* settings; overrides win over the environment"""
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None):
+        overrides = overrides or {}
+
+        def setting(name: str) -> str:
+            return overrides.get(name) or os.getenv(name, DEFAULTS[name])
+
+        seed = setting("MOCK_SEED")
+        self.rng = random.Random(int(seed)) if seed else random.Random()
+
+        self.text_latency = parse_latency(setting("MOCK_TEXT_LATENCY"), self.rng)
+        self.token_latency = parse_latency(setting("MOCK_TOKEN_LATENCY"), self.rng)
+        self.image_latency = parse_latency(setting("MOCK_IMAGE_LATENCY"), self.rng)
+        self.loading_seconds = float(setting("MOCK_LOADING_SECONDS"))
+        self.loading_estimate = float(setting("MOCK_LOADING_ESTIMATE"))
+        self.rate_limit_rate = float(setting("MOCK_RATE_LIMIT_RATE"))
+        self.retry_after = float(setting("MOCK_RETRY_AFTER_SECONDS"))
+        self.error_rate = float(setting("MOCK_ERROR_RATE"))
+        self.timeout_rate = float(setting("MOCK_TIMEOUT_RATE"))
+        self.timeout_seconds = float(setting("MOCK_TIMEOUT_SECONDS"))
+        self.text_tokens = int(setting("MOCK_TEXT_TOKENS"))
+        self.image_size = int(setting("MOCK_IMAGE_SIZE"))
+        self.image_format = setting("MOCK_IMAGE_FORMAT").lower()
+        self.image_models = re.compile(setting("MOCK_IMAGE_MODELS"), re.IGNORECASE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "loading_seconds": self.loading_seconds,
+            "rate_limit_rate": self.rate_limit_rate,
+            "error_rate": self.error_rate,
+            "timeout_rate": self.timeout_rate,
+            "text_tokens": self.text_tokens,
+            "image_size": self.image_size,
+            "image_format": self.image_format
+        }
+
+
+class MockState:
+    """Per-model load phases, rendered images and request counters"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.first_seen: Dict[str, float] = {}
+        self.images: Dict[str, bytes] = {}
+        self.outcomes: Dict[str, int] = {}
+        self.requests: Dict[str, int] = {}
+
+    def count(self, model_id: str, outcome: str):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.requests[model_id] = self.requests.get(model_id, 0) + 1
+
+    async def fault(self, model_id: str) -> Optional[Response]:
+        """Pick an injected failure for this request, or None to serve it"""
+        config = self.config
+        now = time.monotonic()
+        first_seen = self.first_seen.setdefault(model_id, now)
+
+        loading_left = config.loading_seconds - (now - first_seen)
+        if loading_left > 0:
+            self.count(model_id, "model_loading")
+            return JSONResponse(status_code=503, content={
+                "error": f"Model {model_id} is currently loading",
+                "estimated_time": round(min(loading_left, config.loading_estimate), 2)
+            })
+
+        roll = config.rng.random()
+        if roll < config.rate_limit_rate:
+            self.count(model_id, "rate_limited")
+            return JSONResponse(
+                status_code=429,
+                content={"error": "Rate limit reached"},
+                headers={"Retry-After": f"{config.retry_after:g}"}
+            )
+        roll -= config.rate_limit_rate
+
+        if roll < config.error_rate:
+            self.count(model_id, "server_error")
+            return JSONResponse(status_code=500, content={"error": "Internal server error"})
+        roll -= config.error_rate
+
+        if roll < config.timeout_rate:
+            self.count(model_id, "timeout")
+            await asyncio.sleep(config.timeout_seconds)
+            return JSONResponse(status_code=504, content={"error": "Gateway timeout"})
+
+        return None
+
+    async def image_bytes(self, model_id: str) -> Tuple[bytes, str]:
+        """Render once per model so payload sizes are realistic but cheap to serve"""
+        fmt = "jpeg" if self.config.image_format in ("jpg", "jpeg") else "png"
+        if model_id not in self.images:
+            self.images[model_id] = await asyncio.to_thread(
+                render_image, self.config.image_size, fmt
+            )
+        return self.images[model_id], f"image/{fmt}"
+
+    def text(self, n_tokens: int):
+        return [
+            (" " if i else "") + self.config.rng.choice(WORDS)
+            for i in range(n_tokens)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "config": self.config.to_dict(),
+            "outcomes": dict(self.outcomes),
+            "requests_by_model": dict(self.requests)
+        }
+
+
+def render_image(size: int, fmt: str) -> bytes:
+    """Noisy gradient image; noise keeps encoded sizes close to real generations"""
+    gradient = Image.linear_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 48)
+    img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90)))
+
+    buffer = BytesIO()
+    img.save(buffer, format=fmt.upper(), **({"quality": 90} if fmt == "jpeg" else {}))
+    return buffer.getvalue()
+
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    state = MockState(config or MockConfig())
+    app = FastAPI(title="HyperTask Mock Inference")
+
+    @app.api_route("/", methods=["GET", "HEAD"])
+    @app.api_route("/models/", methods=["GET", "HEAD"])
+    async def root():
+        """Reachability check (the agents' HTTP pool warms up with HEAD)"""
+        return {"status": "online", "service": "mock-inference"}
+
+    @app.get("/stats")
+    async def stats():
+        return state.get_stats()
+
+    @app.post("/reset")
+    async def reset():
+        """Restart loading phases and counters"""
+        state.first_seen.clear()
+        state.outcomes.clear()
+        state.requests.clear()
+        return {"status": "reset"}
+
+    @app.post("/models/{model_id:path}")
+    async def infer(model_id: str, request: Request):
+        body = await request.json()
+
+        failure = await state.fault(model_id)
+        if failure is not None:
+            return failure
+
+        if state.config.image_models.search(model_id):
+            await asyncio.sleep(state.config.image_latency())
+            content, media_type = await state.image_bytes(model_id)
+            state.count(model_id, "success")
+            return Response(content=content, media_type=media_type)
+
+        parameters = body.get("parameters") or {}
+        n_tokens = min(state.config.text_tokens, int(parameters.get("max_new_tokens", state.config.text_tokens)))
+        tokens = state.text(max(1, n_tokens))
+        state.count(model_id, "success")
+
+        if body.get("stream"):
+            return StreamingResponse(stream_tokens(state.config, tokens), media_type="text/event-stream")
+
+        await asyncio.sleep(
+            state.config.text_latency() + sum(state.config.token_latency() for _ in tokens)
+        )
+        return [{"generated_text": "".join(tokens)}]
+
+    return app
+
+
+async def stream_tokens(config: MockConfig, tokens):
+    """TGI-style SSE: one event per token, the last carries generated_text"""
+    await asyncio.sleep(config.text_latency())
+    for i, text in enumerate(tokens):
+        if i:
+            await asyncio.sleep(config.token_latency())
+        event = {"token": {"id": i, "text": text, "logprob": -0.1, "special": False}, "generated_text": None}
+        yield f"data: {json.dumps(event)}\n\n"
+
+    final = {
+        "token": {"id": len(tokens), "text": "</s>", "logprob": 0.0, "special": True},
+        "generated_text": "".join(tokens)
+    }
+    yield f"data: {json.dumps(final)}\n\n"
+
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Hugging Face inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for name in DEFAULTS:
+        flag = "--" + name[len("MOCK_"):].lower().replace("_", "-")
+        parser.add_argument(flag, dest=name, help=f"overrides {name} (default {DEFAULTS[name] or 'unset'})")
+    args = parser.parse_args()
+
+    overrides = {name: getattr(args, name) for name in DEFAULTS if getattr(args, name)}
+
+    import uvicorn
+    print(f"Mock inference at http://{args.host}:{args.port}/models/", file=sys.stderr)
+    uvicorn.run(create_app(MockConfig(overrides)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Services Package - shared infrastructure used by the agents and the API
+
+Global instances are imported on first access, so a process that only
+needs one module (an image executor worker importing services.rendering)
+doesn't build caches, stores and queues it will never use. http_pool is
+imported up front because its name is also its module's: once the
+submodule is imported, the package attribute would be the module.
+"""
+import importlib
+
+from services.http_pool import http_pool
+
+_INSTANCES = {
+    'job_queue': 'services.jobs',
+    'logo_cache': 'services.cache',
+    'copy_cache': 'services.cache',
+    'text_flight': 'services.singleflight',
+    'image_flight': 'services.singleflight',
+    'breakers': 'services.circuit_breaker',
+    'text_retry': 'services.retry',
+    'image_retry': 'services.retry',
+    'limiters': 'services.rate_limit',
+    'image_executor': 'services.executor',
+    'loop_monitor': 'services.executor',
+    'artifact_store': 'services.artifacts',
+    'postprocess_metrics': 'services.postprocess'
+}
+
+
+def __getattr__(name):
+    if name in _INSTANCES:
+        return getattr(importlib.import_module(_INSTANCES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['http_pool', 'job_queue', 'logo_cache', 'copy_cache',
+           'text_flight', 'image_flight', 'breakers',
+           'text_retry', 'image_retry', 'limiters',
+           'image_executor', 'loop_monitor', 'artifact_store',
+           'postprocess_metrics']
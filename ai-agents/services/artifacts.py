@@ -0,0 +1,146 @@
+"""
+Artifact Store - Content-addressed storage for binary deliverables
+"""
+import os
+import re
+import hashlib
+import asyncio
+import tempfile
+from typing import Dict, Any, Optional, Tuple
+
+from services.cache import DiskTier
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "jpg": "image/jpeg"
+}
+EXTENSIONS = {media_type: ext for ext, media_type in MEDIA_TYPES.items()}
+
+# <sha256>.<ext>; anything else is rejected before touching the filesystem
+ARTIFACT_ID = re.compile(r"^[0-9a-f]{64}\.(png|webp|jpg)$")
+
+
+class ArtifactStore:
+    """
+    Saves each distinct payload once, named by its SHA-256 and extension
+
+    Ids are stable across restarts and double as strong ETags. Storage is
+    size-bounded; the least recently served artifacts are evicted first.
+    Workers share the directory, so any worker can serve an artifact
+    another one stored, and the bound applies to all of them together.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.disk = DiskTier(directory, max_bytes)
+        self.stored = 0
+        self.deduplicated = 0
+        self.served = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.missing = 0
+
+    async def put(self, data: bytes, media_type: str = "image/png") -> str:
+        """Store data (if new) and return its artifact id"""
+        digest = hashlib.sha256(data).hexdigest()
+        artifact_id = f"{digest}.{EXTENSIONS[media_type]}"
+
+        # locate() takes the tier's lock and stats the file; keep it off the loop
+        if await asyncio.to_thread(self.disk.locate, artifact_id):
+            self.deduplicated += 1
+            return artifact_id
+
+        await asyncio.to_thread(self.disk.set, artifact_id, data)
+        self.stored += 1
+        return artifact_id
+
+    async def open(self, artifact_id: str) -> Optional[Tuple[str, int, str]]:
+        """Return (path, size, media_type) for a stored artifact, or None"""
+        if not ARTIFACT_ID.match(artifact_id):
+            return None
+        found = await asyncio.to_thread(self._locate, artifact_id)
+        if found is None:
+            self.missing += 1
+            return None
+        path, size = found
+        return path, size, MEDIA_TYPES[artifact_id.rsplit(".", 1)[1]]
+
+    def _locate(self, artifact_id: str) -> Optional[Tuple[str, int]]:
+        path = self.disk.locate(artifact_id)
+        if path is None:
+            return None
+        try:
+            return path, os.path.getsize(path)
+        except OSError:
+            return None
+
+    @staticmethod
+    def etag(artifact_id: str) -> str:
+        return f'"{artifact_id.split(".", 1)[0]}"'
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": self.disk.entries,
+            "bytes": self.disk.bytes,
+            "evictions": self.disk.evictions,
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "served": self.served,
+            "not_modified": self.not_modified,
+            "partial": self.partial,
+            "missing": self.missing
+        }
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end)
+
+    Returns None for anything unsatisfiable; multi-range requests are not
+    supported and are treated the same way.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or size == 0:
+        return None
+
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """
+    If-None-Match check: weak comparison, so W/"x" matches "x", and "*"
+    matches any stored artifact
+    """
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
+def inline_by_default() -> bool:
+    """Whether deliverables embed base64 data URIs unless a request says otherwise"""
+    return os.getenv("ARTIFACTS_INLINE_BASE64", "false").lower() == "true"
+
+
+# Global instance
+artifact_store = ArtifactStore(
+    directory=os.getenv("ARTIFACTS_DIR", os.path.join(tempfile.gettempdir(), "hypertask-artifacts")),
+    max_bytes=int(os.getenv("ARTIFACTS_MAX_DISK_MB", "1024")) * 1024 * 1024
+)
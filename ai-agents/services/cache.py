@@ -0,0 +1,293 @@
+"""
+Tiered Cache - Content-addressed byte cache with memory and disk tiers
+"""
+import os
+import json
+import hashlib
+import asyncio
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from loguru import logger
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serializable parts"""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class DiskTier:
+    """
+    Files under a directory, evicted least-recently-used once over max_bytes
+
+    The directory may be shared by several worker processes. Each keeps
+    its own index and adopts files written by other workers the first time
+    it looks them up. Recency is the file's atime, set explicitly on every
+    hit (mtime stays the write time, which TTLs use), so all workers agree
+    on LRU order. A worker rescans the directory whenever it has written
+    SCAN_FRACTION of max_bytes since its last scan, or its own view is over
+    budget, and evicts against the combined total. The directory can
+    therefore overshoot max_bytes by at most that fraction per worker.
+    """
+
+    SCAN_FRACTION = 0.125
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self.adopted = 0
+        self.scans = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        # Bytes this process wrote since its last directory scan
+        self._unscanned = 0
+        # Tier methods run in worker threads, so index updates are serialized
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._rescan()
+
+    @property
+    def entries(self) -> int:
+        return len(self._index)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _rescan(self):
+        """Rebuild the LRU index from the directory (all workers' files), then evict"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, name, stat.st_size))
+
+        self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.bytes = sum(self._index.values())
+        self._unscanned = 0
+        self.scans += 1
+        self._evict()
+
+    def _stat(self, key: str) -> Optional[os.stat_result]:
+        """Stat an entry, adopting it if another worker wrote it; None if gone"""
+        try:
+            stat = os.stat(self._path(key))
+        except OSError:
+            self._forget(key)
+            return None
+        if key not in self._index:
+            self._index[key] = stat.st_size
+            self.bytes += stat.st_size
+            self.adopted += 1
+        return stat
+
+    def _touch(self, key: str, stat: os.stat_result):
+        """Mark an entry recently used, for this process and for the others"""
+        self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key), (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Tuple[bytes, float]]:
+        """Return (data, stored_at), dropping the entry if it is older than ttl"""
+        with self._lock:
+            stat = self._stat(key)
+            if stat is None:
+                return None
+            if ttl is not None and time.time() - stat.st_mtime > ttl:
+                self._delete(key)
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except OSError:
+                self._forget(key)
+                return None
+            self._touch(key, stat)
+            return data, stat.st_mtime
+
+    def locate(self, key: str) -> Optional[str]:
+        """Path of a stored entry (marking it recently used), for streaming reads"""
+        with self._lock:
+            stat = self._stat(key)
+            if stat is None:
+                return None
+            self._touch(key, stat)
+            return self._path(key)
+
+    def set(self, key: str, value: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._forget(key)
+            self._index[key] = len(value)
+            self.bytes += len(value)
+            self._unscanned += len(value)
+            if self.bytes > self.max_bytes or self._unscanned > self.max_bytes * self.SCAN_FRACTION:
+                self._rescan()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._delete(key)
+
+    def _delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+        self._forget(key)
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self.bytes -= size
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            self._delete(key)
+            self.evictions += 1
+
+
+class TieredCache:
+    """Bounded in-memory LRU in front of an optional size-bounded disk tier"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_memory_bytes: int,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 0,
+        ttl: Optional[float] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl = ttl
+        # key -> (value, stored_at)
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self.memory_bytes = 0
+
+        self.disk: Optional[DiskTier] = None
+        if disk_dir and max_disk_bytes > 0:
+            try:
+                self.disk = DiskTier(disk_dir, max_disk_bytes)
+            except OSError as e:
+                logger.warning(f"{name} cache disk tier disabled: {e}")
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.expirations = 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if not self._expired(stored_at):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            self._drop(key)
+            self.expirations += 1
+
+        if self.disk:
+            found = await asyncio.to_thread(self.disk.get, key, self.ttl)
+            if found is not None:
+                value, stored_at = found
+                self.disk_hits += 1
+                self._remember(key, value, stored_at)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes):
+        self._remember(key, value, time.time())
+        if self.disk:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except OSError as e:
+                logger.warning(f"{self.name} cache disk write failed: {e}")
+
+    def _remember(self, key: str, value: bytes, stored_at: float):
+        """Insert into the memory tier, evicting LRU entries over either bound"""
+        if len(value) > self.max_memory_bytes:
+            return
+        self._drop(key)
+        self._memory[key] = (value, stored_at)
+        self.memory_bytes += len(value)
+
+        while self._memory and (
+            len(self._memory) > self.max_entries or self.memory_bytes > self.max_memory_bytes
+        ):
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            self.memory_evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= len(entry[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_evictions": self.memory_evictions,
+            "expirations": self.expirations,
+            "disk_entries": self.disk.entries if self.disk else 0,
+            "disk_bytes": self.disk.bytes if self.disk else 0,
+            "disk_evictions": self.disk.evictions if self.disk else 0
+        }
+
+
+def _cache_dir(name: str) -> str:
+    default = os.path.join(tempfile.gettempdir(), "hypertask-cache", name)
+    return os.getenv(f"{name.upper()}_CACHE_DIR", default)
+
+
+# Global instances
+logo_cache = TieredCache(
+    name="logo",
+    max_entries=int(os.getenv("LOGO_CACHE_MAX_ENTRIES", "64")),
+    max_memory_bytes=int(os.getenv("LOGO_CACHE_MAX_MEMORY_MB", "64")) * 1024 * 1024,
+    disk_dir=_cache_dir("logo"),
+    max_disk_bytes=int(os.getenv("LOGO_CACHE_MAX_DISK_MB", "512")) * 1024 * 1024
+)
+
+copy_cache = TieredCache(
+    name="copy",
+    max_entries=int(os.getenv("COPY_CACHE_MAX_ENTRIES", "512")),
+    max_memory_bytes=int(os.getenv("COPY_CACHE_MAX_MEMORY_MB", "16")) * 1024 * 1024,
+    disk_dir=_cache_dir("copy") if os.getenv("COPY_CACHE_PERSIST", "false").lower() == "true" else None,
+    max_disk_bytes=int(os.getenv("COPY_CACHE_MAX_DISK_MB", "64")) * 1024 * 1024,
+    ttl=float(os.getenv("COPY_CACHE_TTL_SECONDS", "3600"))
+)
@@ -0,0 +1,390 @@
+"""
+Conversation Store - Shared persistence for conversation state across workers
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Any, List, Optional, Tuple
+from loguru import logger
+
+# Marks "not queued" where None is a queued delete
+_MISSING = object()
+
+
+@dataclass
+class Message:
+    """One chat message; roles are interned so every message shares one string"""
+    __slots__ = ("role", "content", "timestamp")
+    role: str
+    content: str
+    timestamp: float
+
+    def __post_init__(self):
+        self.role = sys.intern(self.role)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+
+@dataclass
+class Conversation:
+    """
+    Conversation state, as slotted fields instead of a dict of dicts
+
+    to_dict() is the JSON shape served by GET /conversation/{id} and
+    written by stores.
+    """
+    __slots__ = ("id", "messages", "brand_name", "industry", "extracted_info", "ready_to_execute", "analysis")
+    id: str
+    messages: List[Message]
+    brand_name: Optional[str]
+    industry: Optional[str]
+    extracted_info: Dict[str, Any]
+    ready_to_execute: bool
+    analysis: Optional[Dict[str, Any]]
+
+    @classmethod
+    def new(cls, conversation_id: str) -> "Conversation":
+        return cls(conversation_id, [], None, None, {}, False, None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Conversation":
+        return cls(
+            data["id"],
+            [Message(m["role"], m["content"], m["timestamp"]) for m in data.get("messages", [])],
+            data.get("brand_name"),
+            data.get("industry"),
+            data.get("extracted_info") or {},
+            bool(data.get("ready_to_execute")),
+            data.get("analysis")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "messages": [m.to_dict() for m in self.messages],
+            "brand_name": self.brand_name,
+            "industry": self.industry,
+            "extracted_info": self.extracted_info,
+            "ready_to_execute": self.ready_to_execute,
+            "analysis": self.analysis
+        }
+
+
+class ConversationStore(ABC):
+    """
+    Storage backend behind ConversationManager's in-process cache
+
+    save() may buffer; flush() must make buffered writes visible to other
+    processes. Every save gets a new version token so readers can tell
+    whether their cached copy is still current.
+
+    Reads are called on the event loop and must return promptly; flush()
+    and purge() may block and are run in a worker thread.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def load(self, conversation_id: str, min_updated_at: float) -> Optional[Tuple[Conversation, str]]:
+        """(conversation, version) if stored and written since min_updated_at"""
+
+    @abstractmethod
+    def version(self, conversation_id: str) -> Optional[str]:
+        """Current version token, or None if not stored"""
+
+    @abstractmethod
+    def save(self, conversation_id: str, conv: Conversation) -> str:
+        """Queue a write; returns the version token it will carry"""
+
+    @abstractmethod
+    def delete(self, conversation_id: str):
+        """Queue a delete; the conversation reads as missing right away"""
+
+    @abstractmethod
+    def flush(self):
+        """Write everything queued"""
+
+    @abstractmethod
+    def purge(self, older_than: float) -> int:
+        """Delete conversations (and jobs) last written before older_than"""
+
+    @abstractmethod
+    def save_job(self, job_id: str, record: Dict[str, Any]):
+        """Queue a job status snapshot, written with the next flush"""
+
+    @abstractmethod
+    def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Latest job snapshot, or None if not stored"""
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    SQLite in WAL mode: one host, many worker processes
+
+    Also holds job status snapshots (the jobs table), so job mode can be
+    polled on any worker.
+
+    Rows are keyed by conversation id (a WITHOUT ROWID primary key, so
+    lookups are a single index probe). Writes and deletes are buffered per
+    id, so repeated updates coalesce, and written in transactions of up to
+    batch_size rows. Until its transaction commits, a queued row (including
+    the batch being written) is served from memory, so readers never see
+    an older row mid-flush. synchronous=NORMAL means commits don't fsync; a
+    power loss can drop the last few transactions but never corrupts the
+    database.
+
+    Reads use their own connection with a short busy timeout, since they
+    run on the event loop; in WAL mode they don't wait for writers anyway.
+    Flushes and purges go through a separate, locked writer connection
+    and may wait the full busy timeout for other workers' transactions.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            version TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS conversations_updated_at ON conversations (updated_at);
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, read_timeout: float = 0.1):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, isolation_level=None, timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+        self._reader = sqlite3.connect(path, isolation_level=None, timeout=read_timeout, check_same_thread=False)
+        # Serializes flush/purge/close across threads; pending swaps are guarded separately
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+
+        # Version tokens are unique per process and write
+        self._token_prefix = f"{os.getpid()}-{time.time_ns():x}-"
+        self._tokens = count(1)
+        # conversation id -> (conv, version), or None for a delete; serialized at flush time
+        self._pending: Dict[str, Optional[Tuple[Conversation, str]]] = {}
+        # job id -> latest snapshot
+        self._pending_jobs: Dict[str, Dict[str, Any]] = {}
+        # The batch being written; still served to readers until it commits
+        self._inflight: Dict[str, Optional[Tuple[Conversation, str]]] = {}
+        self._inflight_jobs: Dict[str, Dict[str, Any]] = {}
+
+        self.loads = 0
+        self.load_misses = 0
+        self.writes = 0
+        self.job_writes = 0
+        self.batches = 0
+        self.purged = 0
+        self.errors = 0
+
+    def _queued(self, conversation_id: str):
+        """Unwritten entry for an id (None for a delete), or _MISSING"""
+        # Flushes add to _inflight before removing from _pending, so check in this order
+        entry = self._pending.get(conversation_id, _MISSING)
+        if entry is _MISSING:
+            entry = self._inflight.get(conversation_id, _MISSING)
+        return entry
+
+    def load(self, conversation_id: str, min_updated_at: float) -> Optional[Tuple[Conversation, str]]:
+        entry = self._queued(conversation_id)
+        if entry is not _MISSING:
+            return entry
+
+        self.loads += 1
+        row = self._reader.execute(
+            "SELECT data, version FROM conversations WHERE id = ? AND updated_at >= ?",
+            (conversation_id, min_updated_at)
+        ).fetchone()
+        if row is None:
+            self.load_misses += 1
+            return None
+        return Conversation.from_dict(json.loads(row[0])), row[1]
+
+    def version(self, conversation_id: str) -> Optional[str]:
+        entry = self._queued(conversation_id)
+        if entry is not _MISSING:
+            return entry[1] if entry else None
+        row = self._reader.execute(
+            "SELECT version FROM conversations WHERE id = ?", (conversation_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, conversation_id: str, conv: Conversation) -> str:
+        version = f"{self._token_prefix}{next(self._tokens)}"
+        with self._pending_lock:
+            self._pending[conversation_id] = (conv, version)
+        return version
+
+    def delete(self, conversation_id: str):
+        with self._pending_lock:
+            self._pending[conversation_id] = None
+
+    def save_job(self, job_id: str, record: Dict[str, Any]):
+        with self._pending_lock:
+            self._pending_jobs[job_id] = record
+
+    def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pending = self._pending_jobs.get(job_id) or self._inflight_jobs.get(job_id)
+        if pending is not None:
+            return pending
+        row = self._reader.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def flush(self):
+        with self._write_lock:
+            while self._pending or self._pending_jobs:
+                if not self._flush_batch():
+                    return
+
+    def _flush_batch(self) -> bool:
+        """Write up to batch_size queued rows in one transaction; False on error"""
+        with self._pending_lock:
+            pending = self._take(self._pending, self._inflight, self.batch_size)
+            pending_jobs = self._take(self._pending_jobs, self._inflight_jobs, self.batch_size - len(pending))
+        now = time.time()
+        deletes = [(conversation_id,) for conversation_id, entry in pending.items() if entry is None]
+        try:
+            # Runs off the event loop, which may update a conversation while it
+            # is serialized ("changed size during iteration"); retried below
+            rows = [
+                (conversation_id, json.dumps(entry[0].to_dict(), default=str), entry[1], now)
+                for conversation_id, entry in pending.items() if entry is not None
+            ]
+            job_rows = [
+                (job_id, json.dumps(record, default=str), now)
+                for job_id, record in pending_jobs.items()
+            ]
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany(
+                    "INSERT INTO conversations (id, data, version, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET data = excluded.data, "
+                    "version = excluded.version, updated_at = excluded.updated_at",
+                    rows
+                )
+                self._db.executemany("DELETE FROM conversations WHERE id = ?", deletes)
+                self._db.executemany(
+                    "INSERT INTO jobs (id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    job_rows
+                )
+        except (sqlite3.Error, RuntimeError) as e:
+            # Keep the writes for the next flush unless newer ones replaced them
+            self.errors += 1
+            with self._pending_lock:
+                for conversation_id, entry in pending.items():
+                    self._pending.setdefault(conversation_id, entry)
+                for job_id, record in pending_jobs.items():
+                    self._pending_jobs.setdefault(job_id, record)
+                self._land(pending, pending_jobs)
+            logger.warning(f"Conversation store flush failed ({len(pending) + len(pending_jobs)} rows): {e}")
+            return False
+        with self._pending_lock:
+            self._land(pending, pending_jobs)
+        self.writes += len(rows)
+        self.job_writes += len(job_rows)
+        self.batches += 1
+        return True
+
+    @staticmethod
+    def _take(pending: Dict[str, Any], inflight: Dict[str, Any], limit: int) -> Dict[str, Any]:
+        """Move up to limit queued entries, oldest first, into inflight"""
+        batch = {key: pending[key] for key in list(pending)[:limit]}
+        inflight.update(batch)
+        for key in batch:
+            del pending[key]
+        return batch
+
+    def _land(self, pending: Dict[str, Any], pending_jobs: Dict[str, Any]):
+        """Stop serving a batch from memory: committed, or re-queued after an error"""
+        for conversation_id in pending:
+            self._inflight.pop(conversation_id, None)
+        for job_id in pending_jobs:
+            self._inflight_jobs.pop(job_id, None)
+
+    def purge(self, older_than: float) -> int:
+        with self._write_lock:
+            removed = self._db.execute(
+                "DELETE FROM conversations WHERE updated_at < ?", (older_than,)
+            ).rowcount
+            self._db.execute("DELETE FROM jobs WHERE updated_at < ?", (older_than,))
+        self.purged += removed
+        return removed
+
+    def close(self):
+        self.flush()
+        self._reader.close()
+        with self._write_lock:
+            self._db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "pending": len(self._pending) + len(self._pending_jobs),
+            "loads": self.loads,
+            "load_misses": self.load_misses,
+            "writes": self.writes,
+            "job_writes": self.job_writes,
+            "batches": self.batches,
+            "avg_batch": round(self.writes / self.batches, 1) if self.batches else 0.0,
+            "purged": self.purged,
+            "errors": self.errors
+        }
+
+
+def create_conversation_store() -> Optional[ConversationStore]:
+    """
+    Backend from CONVERSATION_STORE: "memory" (default, None) or "sqlite"
+
+    Falls back to memory-only if the database cannot be opened.
+    """
+    backend = os.getenv("CONVERSATION_STORE", "memory").lower()
+    if backend == "memory":
+        return None
+    if backend != "sqlite":
+        logger.warning(f"Unknown CONVERSATION_STORE '{backend}', keeping conversations in memory")
+        return None
+
+    path = os.getenv(
+        "CONVERSATION_DB_PATH",
+        os.path.join(tempfile.gettempdir(), "hypertask-conversations.db")
+    )
+    try:
+        return SQLiteConversationStore(
+            path,
+            batch_size=int(os.getenv("CONVERSATION_BATCH_SIZE", "64")),
+            read_timeout=float(os.getenv("CONVERSATION_DB_READ_TIMEOUT_MS", "100")) / 1000
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Conversation store disabled, keeping conversations in memory: {e}")
+        return None
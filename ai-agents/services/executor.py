@@ -0,0 +1,138 @@
+"""
+Executor - Run CPU-bound image work off the event loop
+"""
+import os
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, Optional, Callable, TypeVar
+from loguru import logger
+
+T = TypeVar("T")
+
+
+def _timed_call(fn: Callable[..., T], args: tuple, submitted_at: float):
+    """Runs in the worker; wall-clock stamps work across processes"""
+    started_at = time.time()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+class ImageExecutor:
+    """
+    Thread or process pool for Pillow decode/enhance/render/encode steps
+
+    ImageDraw holds the GIL while drawing, so a thread pool still stalls
+    the loop during placeholder renders; processes are the default.
+    IMAGE_EXECUTOR=thread avoids pickling and suits decode/encode-heavy
+    loads. Functions passed to run() must be picklable (module-level), and
+    should live in a light module like services.rendering: spawned workers
+    import the function's module, and everything it imports, to unpickle it.
+    """
+
+    def __init__(self):
+        self.kind = os.getenv("IMAGE_EXECUTOR", "process").lower()
+        self.max_workers = int(os.getenv("IMAGE_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self._executor: Optional[Executor] = None
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_waits: deque = deque(maxlen=200)
+        self.run_times: deque = deque(maxlen=200)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="image"
+                )
+            logger.info(f"Image executor started ({self.kind}, {self.max_workers} workers)")
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            result, queue_wait, run_time = await loop.run_in_executor(
+                self._get_executor(), _timed_call, fn, args, time.time()
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.queue_waits.append(queue_wait)
+        self.run_times.append(run_time)
+        return result
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Image executor stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        def summary(samples: deque) -> Dict[str, float]:
+            if not samples:
+                return {"avg_ms": 0.0, "max_ms": 0.0}
+            return {
+                "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+                "max_ms": round(max(samples) * 1000, 1)
+            }
+
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.max_workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait": summary(self.queue_waits),
+            "run_time": summary(self.run_times)
+        }
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up, to spot blocking work"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=240)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - expected))
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(samples),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 1),
+            "max_ms": round(samples[-1] * 1000, 1)
+        }
+
+
+# Global instances
+image_executor = ImageExecutor()
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,212 @@
+"""
+HTTP Pool - Shared, lifecycle-managed HTTP clients for inference calls
+"""
+import os
+import time
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+
+def _parse_host_limits(raw: str) -> Dict[str, int]:
+    """Parse "host=limit,host=limit" into a dict"""
+    limits = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        host, _, value = item.partition("=")
+        try:
+            limits[host.strip()] = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid host limit: {item}")
+    return limits
+
+
+class HostPool:
+    """One keep-alive client per host, with its own connection limit and stats"""
+
+    def __init__(
+        self,
+        host: str,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        http2: bool
+    ):
+        self.host = host
+        self.max_connections = max_connections
+        self.http2 = http2
+
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+        self.client = httpx.AsyncClient(transport=self._transport, timeout=60.0)
+
+        # Admission happens here rather than inside httpx so wait time is measurable
+        self._slots = asyncio.Semaphore(max_connections)
+        self.in_use = 0
+        self.waiting = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Hold one connection slot for the duration of a request"""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - started
+        self.requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.in_use += 1
+        try:
+            yield self.client
+        finally:
+            self.in_use -= 1
+            self._slots.release()
+
+    def _idle_connections(self) -> int:
+        """Best-effort count of idle keep-alive connections in the pool"""
+        pool = getattr(self._transport, "_pool", None)
+        connections = getattr(pool, "connections", None) or []
+        idle = 0
+        for conn in connections:
+            try:
+                if conn.is_idle():
+                    idle += 1
+            except Exception:
+                continue
+        return idle
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "in_use": self.in_use,
+            "idle": self._idle_connections(),
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 2) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2)
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class HTTPPool:
+    """Registry of per-host pools shared by every agent"""
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+        self.max_keepalive = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+        self.keepalive_expiry = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+        self.host_limits = _parse_host_limits(os.getenv("HTTP_POOL_HOST_LIMITS", ""))
+        self.warmup_urls = [
+            url.strip() for url in os.getenv(
+                "HTTP_POOL_WARMUP_URLS",
+                os.getenv("HF_API_BASE_URL", "https://api-inference.huggingface.co/")
+            ).split(",") if url.strip()
+        ]
+        self.warmup_connections = int(os.getenv("HTTP_POOL_WARMUP_CONNECTIONS", "2"))
+
+        # HTTP/2 needs the optional h2 package (httpx[http2])
+        want_http2 = os.getenv("HTTP_POOL_HTTP2", "true").lower() == "true"
+        self.http2 = want_http2 and importlib.util.find_spec("h2") is not None
+        if want_http2 and not self.http2:
+            logger.warning("h2 not installed; HTTP pool falling back to HTTP/1.1")
+
+        self.pools: Dict[str, HostPool] = {}
+
+    def _pool_for(self, url: str) -> HostPool:
+        """Get or lazily create the pool serving this URL's host"""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        pool = self.pools.get(key)
+        if pool is None:
+            limit = self.host_limits.get(parts.hostname or "", self.max_connections)
+            pool = HostPool(
+                host=key,
+                max_connections=limit,
+                max_keepalive=min(self.max_keepalive, limit),
+                keepalive_expiry=self.keepalive_expiry,
+                http2=self.http2
+            )
+            self.pools[key] = pool
+        return pool
+
+    async def start(self):
+        """Open pools for the configured hosts and warm up connections"""
+        logger.info(f"Starting HTTP pool (http2={self.http2}, max_connections={self.max_connections})")
+        await self.warmup()
+
+    async def warmup(self):
+        """Establish keep-alive connections ahead of the first real request"""
+        async def _touch(url: str):
+            try:
+                async with self._pool_for(url).acquire() as client:
+                    await client.head(url, timeout=10.0)
+            except Exception as e:
+                logger.warning(f"HTTP pool warm-up failed for {url}: {e}")
+
+        await asyncio.gather(*[
+            _touch(url)
+            for url in self.warmup_urls
+            for _ in range(self.warmup_connections)
+        ])
+
+    async def close(self):
+        """Close every client; pools are recreated lazily if used again"""
+        pools, self.pools = self.pools, {}
+        for pool in pools.values():
+            await pool.close()
+        logger.info("HTTP pool closed")
+
+    async def post(self, url: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """POST through the shared pool for the URL's host"""
+        async with self._pool_for(url).acquire() as client:
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+            return await client.post(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streaming response; the connection slot is held until exit"""
+        async with self._pool_for(url).acquire() as client:
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "hosts": [pool.get_stats() for pool in self.pools.values()]
+        }
+
+
+# Global instance
+http_pool = HTTPPool()
@@ -0,0 +1,244 @@
+"""
+Job Queue - Background execution of long-running task batches
+"""
+import os
+import time
+import uuid
+import asyncio
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from loguru import logger
+
+
+class JobQueueFull(Exception):
+    """Raised when the bounded job queue cannot accept more work"""
+
+
+class Job:
+    """A queued /execute run and everything reported about it so far"""
+
+    def __init__(
+        self,
+        conversation_id: str,
+        analysis: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None
+    ):
+        self.id = str(uuid.uuid4())
+        self.conversation_id = conversation_id
+        self.analysis = analysis
+        self.options = options or {}
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.tasks: List[Dict[str, Any]] = [
+            {"task_type": task["task_type"], "agent": task["agent"], "status": "pending"}
+            for task in analysis.get("tasks", [])
+        ]
+        self.deliverables: Dict[int, Dict[str, Any]] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        # Called after every status change, e.g. to publish it to other workers
+        self.listener: Optional[Callable[["Job"], None]] = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Job":
+        """Rebuild a (read-only) job from a record published by another worker"""
+        job = cls(record["conversation_id"], {})
+        job.id = record["job_id"]
+        job.status = record["status"]
+        job.created_at = record["created_at"]
+        job.started_at = record["started_at"]
+        job.finished_at = record["finished_at"]
+        job.tasks = record["tasks"]
+        job.deliverables = dict(enumerate(record["deliverables"]))
+        job.result = record.get("result")
+        job.error = record["error"]
+        return job
+
+    def to_record(self) -> Dict[str, Any]:
+        """Status plus the final result, as stored for other workers"""
+        return {**self.to_dict(), "result": self.result}
+
+    def changed(self):
+        if self.listener:
+            self.listener(self)
+
+    def record_event(self, event: Dict[str, Any]):
+        """Apply a task event emitted by ManagerAgent.execute_tasks"""
+        index = event.get("index")
+        if index is None or index >= len(self.tasks):
+            return
+
+        kind = event["event"]
+        if kind == "task_started":
+            self.tasks[index]["status"] = "running"
+        elif kind == "task_completed":
+            self.tasks[index]["status"] = "completed"
+            self.deliverables[index] = event["deliverable"]
+        elif kind == "task_failed":
+            self.tasks[index]["status"] = "failed"
+            self.tasks[index]["error"] = event.get("error")
+        else:
+            return
+        self.changed()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "conversation_id": self.conversation_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "tasks": self.tasks,
+            "deliverables": [self.deliverables[i] for i in sorted(self.deliverables)],
+            "error": self.error
+        }
+
+
+class JobQueue:
+    """
+    Bounded queue drained by a fixed pool of worker coroutines
+
+    Jobs run in the worker process that accepted them. With a shared store
+    (CONVERSATION_STORE=sqlite), every status change is published to it,
+    so /jobs/{id} can be polled on any worker; status seen elsewhere lags
+    by up to one store flush. Without one, job status lives in the
+    accepting process only and multi-worker deployments need sticky
+    sessions for job mode.
+    """
+
+    def __init__(self):
+        self.max_queue = int(os.getenv("JOBS_MAX_QUEUE", "100"))
+        self.num_workers = int(os.getenv("JOBS_WORKERS", "4"))
+        self.retention = float(os.getenv("JOBS_RETENTION_SECONDS", "3600"))
+
+        self.jobs: Dict[str, Job] = {}
+        self.store = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._handler: Optional[Callable[[Job], Awaitable[Dict[str, Any]]]] = None
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def start(self, handler: Callable[[Job], Awaitable[Dict[str, Any]]], store=None):
+        """
+        Start the worker pool; handler runs a job and returns its result
+
+        store is an optional ConversationStore that job status is shared through.
+        """
+        self._handler = handler
+        self.store = store
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.num_workers)
+        ]
+        logger.info(f"Job queue started with {self.num_workers} workers (max queue {self.max_queue})")
+
+    async def stop(self):
+        """Cancel workers; queued jobs are abandoned"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Job queue stopped")
+
+    def submit(
+        self,
+        conversation_id: str,
+        analysis: Dict[str, Any],
+        options: Optional[Dict[str, Any]] = None
+    ) -> Job:
+        """Queue a job or raise JobQueueFull"""
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        self._prune()
+        job = Job(conversation_id, analysis, options)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(f"Job queue is full ({self.max_queue} jobs waiting)")
+
+        self.jobs[job.id] = job
+        if self.store:
+            job.listener = self._publish
+            self._publish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job accepted here, or one another worker published to the store"""
+        job = self.jobs.get(job_id)
+        if job is None and self.store:
+            record = self.store.load_job(job_id)
+            if record is not None:
+                job = Job.from_record(record)
+        return job
+
+    def _publish(self, job: Job):
+        try:
+            self.store.save_job(job.id, job.to_record())
+        except Exception as e:
+            logger.warning(f"Could not publish job {job.id}: {e}")
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            job.changed()
+            self.running += 1
+            try:
+                job.result = await self._handler(job)
+                job.status = job.result.get("status", "completed")
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "Job cancelled during shutdown"
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} failed on worker {worker_id}: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                job.changed()
+                self.running -= 1
+                if job.status == "failed":
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                self._queue.task_done()
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window"""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "workers": len(self._workers),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "tracked_jobs": len(self.jobs),
+            "shared": self.store is not None
+        }
+
+
+# Global instance
+job_queue = JobQueue()
@@ -0,0 +1,109 @@
+"""
+Keyword Matcher - Single-pass, whole-word keyword detection for intent parsing
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Punctuation becomes a word separator, so "logo," and "brand's" still match
+_SEPARATORS = str.maketrans({
+    char: " " for char in "!\"#$%&'()*+,-./:;<=>?@[\\]^`{|}~‘’“”–—…"
+})
+
+
+def _words(text: str) -> List[str]:
+    return text.lower().translate(_SEPARATORS).split()
+
+
+# Single keywords at least this long also match as word prefixes
+PREFIX_MIN = 4
+
+
+def _forms(word: str) -> Tuple[str, ...]:
+    """A keyword and its plural; very short words ("hi", "ai") only match as-is"""
+    if len(word) < 3:
+        return (word,)
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word, word + "es"
+    if word.endswith("y") and word[-2] not in "aeiou":
+        return word, word[:-1] + "ies"
+    return word, word + "s"
+
+
+class KeywordMatcher:
+    """
+    Keyword groups matched against a message in a single pass
+
+    groups maps a group name to its categories, and each category maps to
+    its keywords, e.g. {"task": {"design": ["logo", "icon"], ...}}. scan()
+    splits the text into words once and returns, for every group, the
+    categories hit, in the order they were defined, so "first category
+    wins" checks keep their priority order.
+
+    Keywords match whole words, case-insensitively, plurals included:
+    "logos" counts for "logo", but "hi" no longer matches inside "this"
+    and "app" no longer matches inside "happy". Single keywords of
+    PREFIX_MIN letters or more also match the start of a word, so stems
+    keep working: "bank" finds "banking", "health" finds "healthcare",
+    "design" finds "designing". Single-word keywords are found with one
+    set intersection against the message's words, plus one lookup per
+    word for keywords it could start with; phrases ("landing page") are only looked
+    for when their first word occurs.
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, Iterable[str]]]):
+        self.groups = {
+            group: {category: list(keywords) for category, keywords in categories.items()}
+            for group, categories in groups.items()
+        }
+        self._categories: Dict[str, List[str]] = {group: list(categories) for group, categories in groups.items()}
+        # word form -> every (group, category position) it counts for
+        self._single: Dict[str, List[Tuple[str, int]]] = {}
+        # first PREFIX_MIN letters -> [(keyword, (group, category position))], for prefix matches
+        self._prefixes: Dict[str, List[Tuple[str, Tuple[str, int]]]] = {}
+        # first word -> [(phrase forms, (group, category position))]
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], Tuple[str, int]]]] = {}
+
+        for group, categories in self.groups.items():
+            for position, keywords in enumerate(categories.values()):
+                for keyword in keywords:
+                    words = _words(keyword)
+                    if len(words) == 1:
+                        for form in _forms(words[0]):
+                            self._single.setdefault(form, []).append((group, position))
+                        if len(words[0]) >= PREFIX_MIN:
+                            self._prefixes.setdefault(words[0][:PREFIX_MIN], []).append(
+                                (words[0], (group, position))
+                            )
+                    else:
+                        head = " ".join(words[:-1])
+                        forms = tuple(f" {head} {form} " for form in _forms(words[-1]))
+                        self._phrases.setdefault(words[0], []).append((forms, (group, position)))
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Categories hit in each group, in definition order"""
+        words = _words(text)
+        present = set(words)
+        hits: Dict[str, Set[int]] = {group: set() for group in self.groups}
+
+        for word in present & self._single.keys():
+            for group, position in self._single[word]:
+                hits[group].add(position)
+
+        # Exact words were matched above, so only longer words can add prefix hits
+        for word in present:
+            if len(word) > PREFIX_MIN and word[:PREFIX_MIN] in self._prefixes:
+                for keyword, (group, position) in self._prefixes[word[:PREFIX_MIN]]:
+                    if word.startswith(keyword):
+                        hits[group].add(position)
+
+        heads = present & self._phrases.keys()
+        if heads:
+            joined = f" {' '.join(words)} "
+            for head in heads:
+                for forms, (group, position) in self._phrases[head]:
+                    if any(form in joined for form in forms):
+                        hits[group].add(position)
+
+        return {
+            group: [self._categories[group][position] for position in sorted(positions)]
+            for group, positions in hits.items()
+        }
@@ -0,0 +1,213 @@
+"""
+Post-Processing - Configurable, lightweight enhancement chain for generated images
+"""
+import time
+from collections import deque
+from typing import Dict, Any, List, Tuple
+from PIL import Image, ImageFilter
+
+from services.image_codecs import downscale
+
+# Stage order is fixed: geometry first, then sharpen, then contrast
+STAGES = ("resize", "sharpen", "contrast")
+DEFAULT_CHAIN = "resize:1024,sharpen:1.2,contrast:1.1"
+
+# ImageFilter.SMOOTH, which ImageEnhance.Sharpness blends against
+SMOOTH = (1, 1, 1, 1, 5, 1, 1, 1, 1)
+
+# p1..p99 spread (per band) at which contrast is already at spec
+FULL_RANGE = 242
+
+
+class PostProcessChain:
+    """
+    Post-processing steps parsed from a spec like "resize:1024,contrast:1.1"
+
+    Sharpen runs as one 3x3 kernel and contrast as a lookup table, instead
+    of the ImageEnhance passes, each of which allocates full-size
+    intermediates. Contrast is computed on the sharpened image (its mean
+    and range included), as the sequential Sharpness-then-Contrast passes
+    do. Resize is skipped for images within the edge limit, contrast for
+    images already spanning the full range.
+    "none" (or an empty spec) disables post-processing.
+    """
+
+    def __init__(self, steps: Dict[str, float]):
+        self.steps = {name: steps[name] for name in STAGES if name in steps}
+
+    @classmethod
+    def parse(cls, spec: str) -> "PostProcessChain":
+        steps: Dict[str, float] = {}
+        spec = spec.strip().lower()
+        if spec in ("", "none"):
+            return cls(steps)
+
+        for part in spec.split(","):
+            name, _, value = part.strip().partition(":")
+            if name not in STAGES:
+                raise ValueError(f"Unknown post-processing stage '{name}' (use {', '.join(STAGES)})")
+            if not value:
+                raise ValueError(f"Post-processing stage '{name}' needs a value, e.g. {name}:1.1")
+            steps[name] = int(value) if name == "resize" else float(value)
+
+        # Identity factors are no-ops; drop them rather than run them
+        return cls({name: value for name, value in steps.items() if name == "resize" or value != 1.0})
+
+    @property
+    def spec(self) -> str:
+        return ",".join(f"{name}:{value:g}" for name, value in self.steps.items()) or "none"
+
+    def is_noop(self, size: Tuple[int, int]) -> bool:
+        """True if an image of this size would come out unchanged"""
+        if "sharpen" in self.steps or "contrast" in self.steps:
+            return False
+        return "resize" not in self.steps or max(size) <= self.steps["resize"]
+
+    def draft(self, img: Image.Image):
+        """Before load(): let JPEGs decode at reduced scale when resize shrinks them anyway"""
+        edge = self.steps.get("resize")
+        if edge and max(img.size) > edge:
+            img.draft(img.mode, (edge, edge))
+
+    def apply(self, img: Image.Image) -> Tuple[Image.Image, Dict[str, Any]]:
+        """
+        Run the chain; returns (image, report)
+
+        report["timings"] holds seconds per executed pass ("resize",
+        "tone"); report["skipped"] lists stages that were not needed.
+        """
+        timings: Dict[str, float] = {}
+        skipped: List[str] = []
+
+        edge = self.steps.get("resize")
+        if edge:
+            if max(img.size) > edge:
+                started = time.perf_counter()
+                img = downscale(img, edge)
+                timings["resize"] = time.perf_counter() - started
+            else:
+                skipped.append("resize")
+
+        if "sharpen" in self.steps or "contrast" in self.steps:
+            started = time.perf_counter()
+            img, tone_skipped = self._tone(img)
+            skipped.extend(tone_skipped)
+            if len(tone_skipped) < len(self.steps.keys() & {"sharpen", "contrast"}):
+                timings["tone"] = time.perf_counter() - started
+
+        return img, {"timings": timings, "skipped": skipped}
+
+    def _tone(self, img: Image.Image) -> Tuple[Image.Image, List[str]]:
+        """Sharpen, then contrast, one output image per stage"""
+        sharpen = self.steps.get("sharpen", 1.0)
+        contrast = self.steps.get("contrast", 1.0)
+
+        alpha = None
+        if img.mode in ("RGBA", "LA"):
+            # The kernel and table would change alpha too; process color bands only
+            alpha = img.getchannel("A")
+            img = img.convert(img.mode[:-1])
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        skipped = []
+        out = img
+        if sharpen != 1.0:
+            # sharpen * x - (sharpen - 1) * smooth(x); like Sharpness, the 1px border is left as is
+            weights = [
+                (sharpen if i == 4 else 0.0) - (sharpen - 1.0) * w / 13.0
+                for i, w in enumerate(SMOOTH)
+            ]
+            out = out.filter(ImageFilter.Kernel((3, 3), weights, scale=1))
+
+        if contrast != 1.0:
+            histogram = out.histogram()
+            if _spans_full_range(histogram):
+                skipped.append("contrast")
+            else:
+                out = out.point(_contrast_lut(histogram, contrast))
+
+        if alpha is not None:
+            out.putalpha(alpha)
+        return out, skipped
+
+
+def _band_histograms(histogram: List[int]) -> List[List[int]]:
+    return [histogram[i:i + 256] for i in range(0, len(histogram), 256)]
+
+
+def _spans_full_range(histogram: List[int]) -> bool:
+    """Whether every band's 1st..99th percentile already covers FULL_RANGE levels"""
+    for band in _band_histograms(histogram):
+        total = sum(band)
+        if not total:
+            return False
+        low_count, high_count = total * 0.01, total * 0.99
+        seen, low, high = 0, None, 255
+        for level, count in enumerate(band):
+            seen += count
+            if low is None and seen > low_count:
+                low = level
+            if seen >= high_count:
+                high = level
+                break
+        if high - low < FULL_RANGE:
+            return False
+    return True
+
+
+def _contrast_lut(histogram: List[int], factor: float) -> List[int]:
+    """
+    Per-band lookup table matching ImageEnhance.Contrast
+
+    Contrast pulls every band toward the mean luminance, computed here
+    from the band histograms instead of a grayscale copy.
+    """
+    bands = _band_histograms(histogram)
+    means = [sum(level * count for level, count in enumerate(band)) / max(1, sum(band)) for band in bands]
+    if len(means) == 3:
+        mean = int(0.299 * means[0] + 0.587 * means[1] + 0.114 * means[2] + 0.5)
+    else:
+        mean = int(means[0] + 0.5)
+
+    offset = (1.0 - factor) * mean
+    table = [min(255, max(0, int(factor * level + offset + 0.5))) for level in range(256)]
+    return table * len(bands)
+
+
+class PostProcessMetrics:
+    """Per-model, per-stage post-processing timings and skip counts"""
+
+    def __init__(self):
+        self.images: Dict[str, int] = {}
+        self.timings: Dict[str, Dict[str, deque]] = {}
+        self.skipped: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model: str, report: Dict[str, Any]):
+        self.images[model] = self.images.get(model, 0) + 1
+        stages = self.timings.setdefault(model, {})
+        for stage, seconds in report["timings"].items():
+            stages.setdefault(stage, deque(maxlen=200)).append(seconds)
+        skipped = self.skipped.setdefault(model, {})
+        for stage in report["skipped"]:
+            skipped[stage] = skipped.get(stage, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {}
+        for model, images in self.images.items():
+            stats[model] = {
+                "images": images,
+                "stages": {
+                    stage: {
+                        "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+                        "max_ms": round(max(samples) * 1000, 1)
+                    }
+                    for stage, samples in self.timings.get(model, {}).items()
+                },
+                "skipped": dict(self.skipped.get(model, {}))
+            }
+        return stats
+
+
+# Global instance
+postprocess_metrics = PostProcessMetrics()
@@ -0,0 +1,168 @@
+"""
+Rate Limit - Per-model admission control for outbound inference calls
+"""
+import os
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+
+
+class AdmissionTimeout(Exception):
+    """Raised when a call waits in the admission queue longer than allowed"""
+
+
+class ModelLimiter:
+    """
+    Concurrency cap plus token bucket, with a fair FIFO wait queue
+
+    A call is admitted when a concurrency slot is free and a token is
+    available; callers are admitted strictly in arrival order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        rate: float,
+        burst: int,
+        queue_timeout: float
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.rate = rate  # tokens per second; <= 0 disables the bucket
+        self.burst = max(1, burst)
+        self.queue_timeout = queue_timeout
+
+        self.tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.admitted = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _try_admit(self) -> bool:
+        """Take a slot and a token if both are available"""
+        if self.in_flight >= self.max_concurrency:
+            return False
+        if self.rate > 0:
+            self._refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+        self.in_flight += 1
+        return True
+
+    def _wake(self):
+        """Admit waiters from the head of the queue while capacity allows"""
+        while self._waiters:
+            if self._waiters[0].done():
+                self._waiters.popleft()
+                continue
+            if not self._try_admit():
+                break
+            self._waiters.popleft().set_result(None)
+
+        # Out of tokens with callers still waiting: come back when one refills
+        if self._waiters and self.in_flight < self.max_concurrency and self._timer is None:
+            delay = max(0.0, (1 - self.tokens) / self.rate) if self.rate > 0 else 0.0
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._wake()
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Wait for admission (at most queue_timeout), hold it for the block"""
+        limit = self.queue_timeout if timeout is None else min(self.queue_timeout, timeout)
+        started = time.monotonic()
+
+        if self._waiters or not self._try_admit():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._wake()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), timeout=limit)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted just as we gave up: hand the slot back
+                    self._release()
+                else:
+                    waiter.cancel()
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                    raise AdmissionTimeout(
+                        f"{self.name}: waited {limit:.1f}s for an inference slot"
+                    )
+                raise
+
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate,
+            "in_flight": self.in_flight,
+            "queue_depth": sum(1 for w in self._waiters if not w.done()),
+            "tokens": round(self.tokens, 2),
+            "admitted": self.admitted,
+            "queue_timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1)
+        }
+
+
+class LimiterRegistry:
+    """One limiter per model, created on first use"""
+
+    def __init__(self):
+        self.max_concurrency = int(os.getenv("LIMIT_MAX_CONCURRENCY", "4"))
+        self.rate = float(os.getenv("LIMIT_RATE_PER_SECOND", "2"))
+        self.burst = int(os.getenv("LIMIT_BURST", "4"))
+        self.queue_timeout = float(os.getenv("LIMIT_QUEUE_TIMEOUT_SECONDS", "30"))
+        self.limiters: Dict[str, ModelLimiter] = {}
+
+    def get(self, model: str) -> ModelLimiter:
+        limiter = self.limiters.get(model)
+        if limiter is None:
+            limiter = ModelLimiter(
+                model,
+                max_concurrency=self.max_concurrency,
+                rate=self.rate,
+                burst=self.burst,
+                queue_timeout=self.queue_timeout
+            )
+            self.limiters[model] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {model: limiter.get_stats() for model, limiter in self.limiters.items()}
+
+
+# Global instance
+limiters = LimiterRegistry()
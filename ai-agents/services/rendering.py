@@ -0,0 +1,303 @@
+"""
+Rendering - Image work run in the image executor: generated-image processing and placeholder compositing
+
+Deliberately light on imports (Pillow and the codec/post-processing
+modules only): under spawn or forkserver every pool worker imports this
+module, and nothing else from the app, to unpickle the functions it runs.
+"""
+import os
+import math
+import time
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+from services.image_codecs import encode_variants
+from services.postprocess import PostProcessChain
+
+COLOR_NAMES = {
+    "purple": (139, 92, 246),
+    "cyan": (6, 182, 212),
+    "blue": (59, 130, 246),
+    "green": (16, 185, 129),
+    "red": (239, 68, 68),
+    "orange": (245, 158, 11),
+    "pink": (236, 72, 153),
+    "brown": (120, 53, 15),
+    "cream": (245, 222, 179),
+    "gold": (234, 179, 8),
+    "silver": (192, 192, 192),
+}
+
+
+class LayerCache:
+    """
+    Small LRU of rendered placeholder layers
+
+    Lives in whichever process renders, so with a process pool each worker
+    warms its own copy. With a thread pool the workers share it, so lookups
+    and updates hold a lock; builds run outside it, and two threads missing
+    on the same key may both build it.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, build) -> Tuple[Any, bool]:
+        """Return (layer, was_cached), building and storing it on a miss"""
+        with self._lock:
+            layer = self.entries.get(key)
+            if layer is not None:
+                self.entries.move_to_end(key)
+                return layer, True
+
+        layer = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self.entries[key] = layer
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return layer, False
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+def process_generated(
+    image_bytes: bytes,
+    output: Dict[str, Any],
+    chain: PostProcessChain,
+    passthrough: bool = False
+) -> Tuple[Dict[int, bytes], Tuple[int, int], Dict[str, Any]]:
+    """
+    Decode, post-process and encode a generated image
+
+    Returns ({size: bytes}, size, report), where report carries the
+    per-stage timings back from the worker. With passthrough the caller
+    serves image_bytes as the full-size variant, so only the smaller
+    sizes are produced; JPEG sources are then decoded at reduced scale.
+    """
+    # BytesIO shares the bytes object rather than copying it
+    img = Image.open(BytesIO(image_bytes))
+    size = img.size
+
+    if passthrough:
+        smaller = [edge for edge in output["sizes"] if edge < max(size)]
+        img.draft(img.mode, (max(smaller), max(smaller)))
+        return encode_variants(img, {**output, "sizes": smaller}, native=False), size, {}
+
+    chain.draft(img)
+    started = time.perf_counter()
+    img.load()
+    decoded = time.perf_counter()
+
+    # Post-process for better quality
+    img, report = chain.apply(img)
+
+    encoding = time.perf_counter()
+    variants = encode_variants(img, output)
+    report["timings"] = {
+        "decode": decoded - started,
+        **report["timings"],
+        "encode": time.perf_counter() - encoding
+    }
+    return variants, img.size, report
+
+
+def render_placeholder(
+    brand_name: str,
+    colors: list,
+    style: str,
+    output: Dict[str, Any]
+) -> Tuple[Dict[int, bytes], Dict[str, bool]]:
+    """
+    Composite the placeholder logo from cached layers
+
+    Returns the encoded resolutions plus which caches hit (layer hits only
+    count when the finished PNG was not cached already). The
+    output depends only on style, colors, initial and encoding, so
+    finished encodes are cached too; encoding is most of the cost of a fresh render.
+    """
+
+    # Parse colors
+    primary = parse_color(colors[0] if colors else "#8B5CF6")
+    secondary = parse_color(colors[1] if len(colors) > 1 else "#06B6D4")
+
+    if "minimal" in style.lower():
+        kind = "minimal"
+    elif "tech" in style.lower():
+        kind = "tech"
+    else:
+        kind = "modern"
+
+    initial = brand_name[0].upper() if brand_name else "B"
+    hits = {"encoded": True, "background": False, "glyph": False}
+
+    def compose() -> Dict[int, bytes]:
+        hits["encoded"] = False
+        background, hits["background"] = backgrounds.get_or_create(
+            (kind, primary, secondary),
+            lambda: render_background(kind, primary, secondary)
+        )
+
+        # Add brand name
+        (glyph, offset), hits["glyph"] = glyphs.get_or_create(
+            (initial, "white"),
+            lambda: _render_glyph(initial, "white")
+        )
+
+        img = background.copy()
+        img.paste(glyph, offset, glyph)
+        return encode_variants(img, output)
+
+    encoding = (output["format"], output["effort"], output["quality"], tuple(output["sizes"]))
+    variants, _ = encoded_placeholders.get_or_create(
+        (kind, primary, secondary, initial, encoding), compose
+    )
+    return variants, hits
+
+
+def render_background(kind: str, primary: tuple, secondary: tuple) -> Image.Image:
+    """Style gradient plus its accents, without the initial"""
+
+    center = 512
+
+    # Create high-res image
+    img = Image.new('RGB', (1024, 1024), color='white')
+    draw = ImageDraw.Draw(img)
+
+    if kind == "minimal":
+        # Minimalist geometric design
+        _draw_minimal_logo(draw, center, primary, secondary)
+    elif kind == "tech":
+        # Tech-focused design
+        _draw_tech_logo(draw, center, primary, secondary)
+    else:
+        # Default modern design
+        _draw_modern_logo(draw, center, primary, secondary)
+
+    return img
+
+
+def _draw_minimal_logo(draw, center, primary, secondary):
+    """Draw minimalist logo"""
+    # Simple circle with gradient effect
+    for i in range(20, 0, -1):
+        radius = i * 10
+        color = _blend_colors(primary, secondary, i / 20)
+        draw.ellipse(
+            [center - radius, center - radius, center + radius, center + radius],
+            fill=color,
+            outline=None
+        )
+
+    # Geometric accent
+    accent_size = 80
+    draw.rectangle(
+        [center - accent_size, center - accent_size,
+         center + accent_size, center + accent_size],
+        outline=primary,
+        width=8
+    )
+
+
+def _draw_tech_logo(draw, center, primary, secondary):
+    """Draw tech-focused logo"""
+    # Hexagonal pattern
+    for i in range(5):
+        radius = 150 - i * 25
+        color = _blend_colors(primary, secondary, i / 5)
+        draw.polygon(_hexagon_points(center, radius), fill=color, outline=primary if i == 0 else None)
+
+
+def _draw_modern_logo(draw, center, primary, secondary):
+    """Draw modern gradient logo"""
+    # Gradient circles
+    for i in range(15, 0, -1):
+        radius = i * 18
+        color = _blend_colors(primary, secondary, i / 15)
+        draw.ellipse(
+            [center - radius, center - radius, center + radius, center + radius],
+            fill=color,
+            outline=None
+        )
+
+
+def _render_glyph(initial: str, fill) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Render the centered initial with its drop shadow as an RGBA layer
+
+    Returns the layer and where to paste it on the 1024x1024 canvas.
+    """
+    font = _logo_font()
+
+    # Calculate text position
+    bbox = font.getbbox(initial)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    text_x = (1024 - text_width) // 2
+    text_y = (1024 - text_height) // 2
+
+    shadow = 4
+    layer = Image.new('RGBA', (text_width + shadow, text_height + shadow), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+
+    # Draw with shadow for depth
+    draw.text((shadow - bbox[0], shadow - bbox[1]), initial, fill=(0, 0, 0, 255), font=font)
+    draw.text((-bbox[0], -bbox[1]), initial, fill=fill, font=font)
+
+    return layer, (text_x + bbox[0], text_y + bbox[1])
+
+
+def parse_color(color: str) -> tuple:
+    """Parse a color name or hex string to an RGB tuple"""
+
+    color_lower = color.lower()
+    if color_lower in COLOR_NAMES:
+        return COLOR_NAMES[color_lower]
+
+    if color.startswith("#"):
+        color = color[1:]
+        try:
+            return tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
+        except ValueError:
+            pass
+
+    return (139, 92, 246)  # Default purple
+
+
+def _blend_colors(color1: tuple, color2: tuple, ratio: float) -> tuple:
+    """Blend two colors smoothly"""
+    return tuple(int(color1[i] * ratio + color2[i] * (1 - ratio)) for i in range(3))
+
+
+@lru_cache(maxsize=1)
+def _logo_font():
+    """Load the placeholder font once per process"""
+    for path in ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "/System/Library/Fonts/Helvetica.ttc"):
+        try:
+            return ImageFont.truetype(path, 180)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _hexagon_points(center: int, radius: float) -> list:
+    """Vertices of the flat-topped hexagon used by the tech style"""
+    return [
+        (center + radius * math.cos(math.radians(angle)), center + radius * math.sin(math.radians(angle)))
+        for angle in range(0, 360, 60)
+    ]
+
+
+# Per-process layer caches, so outage-time placeholders are a cheap composite
+backgrounds = LayerCache(int(os.getenv("DESIGNBOT_BACKGROUND_CACHE_SIZE", "16")))
+glyphs = LayerCache(int(os.getenv("DESIGNBOT_GLYPH_CACHE_SIZE", "128")))
+encoded_placeholders = LayerCache(int(os.getenv("DESIGNBOT_PLACEHOLDER_CACHE_SIZE", "256")))
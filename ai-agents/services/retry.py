@@ -0,0 +1,185 @@
+"""
+Retry Policy - Deadline-aware retries for inference API calls
+"""
+import os
+import time
+import random
+import asyncio
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+import httpx
+from loguru import logger
+
+
+class RetryExhausted(Exception):
+    """Raised when attempts or the deadline run out without a usable response"""
+
+    def __init__(
+        self,
+        message: str,
+        last_response: Optional[httpx.Response] = None,
+        last_error: Optional[Exception] = None
+    ):
+        super().__init__(message)
+        self.last_response = last_response
+        self.last_error = last_error
+
+
+def _estimated_time(response: httpx.Response) -> Optional[float]:
+    """Read the inference API's "model is loading" estimate from a 503 body"""
+    try:
+        value = response.json().get("estimated_time")
+        return float(value) if value is not None else None
+    except Exception:
+        return None
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retries transport errors, 429s and 5xx responses within one deadline
+
+    A 503 that carries estimated_time waits exactly that long (the model is
+    loading); anything else uses exponential backoff with full jitter. A
+    wait that would overrun the deadline ends the call early instead.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int,
+        deadline: float,
+        attempt_timeout: float,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0
+    ):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.outcomes: Dict[str, int] = {}
+        self.recent: deque = deque(maxlen=50)
+        self.calls = 0
+        self.exhausted = 0
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _record(self, label: str, attempt: int, outcome: str, status: Optional[int], elapsed: float, wait: Optional[float]):
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.recent.append({
+            "target": label,
+            "attempt": attempt,
+            "outcome": outcome,
+            "status": status,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "wait_s": round(wait, 2) if wait is not None else None,
+            "at": time.time()
+        })
+
+    async def run(
+        self,
+        send: Callable[[float], Awaitable[httpx.Response]],
+        label: str = "",
+        deadline: Optional[float] = None
+    ) -> httpx.Response:
+        """
+        Call send(timeout) until it succeeds, fails permanently or time runs out
+
+        Returns the first 2xx response, or a non-retryable (4xx) response
+        as-is. Raises RetryExhausted otherwise. deadline (seconds) replaces
+        the policy's default for this call, e.g. to fit a request's budget.
+        """
+        self.calls += 1
+        end = time.monotonic() + (self.deadline if deadline is None else deadline)
+        last_response: Optional[httpx.Response] = None
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+
+            started = time.monotonic()
+            wait: Optional[float] = None
+            status: Optional[int] = None
+            try:
+                response = await send(min(self.attempt_timeout, remaining))
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                last_error = e
+                outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "transport_error"
+                wait = self._backoff(attempt)
+            else:
+                last_response = response
+                status = response.status_code
+                if status < 400:
+                    self._record(label, attempt, "success", status, time.monotonic() - started, None)
+                    return response
+                if status == 503 and _estimated_time(response) is not None:
+                    outcome = "model_loading"
+                    wait = _estimated_time(response)
+                elif status == 429:
+                    outcome = "rate_limited"
+                    wait = _retry_after(response) or self._backoff(attempt)
+                elif status >= 500:
+                    outcome = "server_error"
+                    wait = self._backoff(attempt)
+                else:
+                    self._record(label, attempt, "client_error", status, time.monotonic() - started, None)
+                    return response
+
+            remaining = end - time.monotonic()
+            if attempt == self.max_attempts or wait >= remaining:
+                self._record(label, attempt, outcome, status, time.monotonic() - started, None)
+                break
+
+            self._record(label, attempt, outcome, status, time.monotonic() - started, wait)
+            logger.info(f"{label or self.name}: {outcome} on attempt {attempt}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        self.exhausted += 1
+        raise RetryExhausted(
+            f"{label or self.name} gave up after {attempt} attempt(s)",
+            last_response=last_response,
+            last_error=last_error
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "exhausted": self.exhausted,
+            "max_attempts": self.max_attempts,
+            "deadline_seconds": self.deadline,
+            "outcomes": dict(self.outcomes),
+            "recent_attempts": list(self.recent)[-10:]
+        }
+
+
+# Global instances
+image_retry = RetryPolicy(
+    name="image",
+    max_attempts=int(os.getenv("RETRY_IMAGE_MAX_ATTEMPTS", "4")),
+    deadline=float(os.getenv("RETRY_IMAGE_DEADLINE_SECONDS", "120")),
+    attempt_timeout=90.0,
+    base_delay=float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1")),
+    max_delay=float(os.getenv("RETRY_MAX_DELAY_SECONDS", "20"))
+)
+
+text_retry = RetryPolicy(
+    name="text",
+    max_attempts=int(os.getenv("RETRY_TEXT_MAX_ATTEMPTS", "3")),
+    deadline=float(os.getenv("RETRY_TEXT_DEADLINE_SECONDS", "90")),
+    attempt_timeout=60.0,
+    base_delay=float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1")),
+    max_delay=float(os.getenv("RETRY_MAX_DELAY_SECONDS", "20"))
+)